@@ -25,6 +25,8 @@ DEPTH_TRACKER_BOX_SCALE: float = 1.0
 DEPTH_TRACKER_MIN_DEPTH: int = 500
 DEPTH_TRACKER_MAX_DEPTH: int = 10000
 
+XLINK_OUT_QUEUE_SIZE: int = 2
+
 class FrameType(Enum):
     NONE_ = 0
     VIDEO = 1
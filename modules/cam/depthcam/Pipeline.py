@@ -1,5 +1,6 @@
 import depthai as dai
 from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
 
 from modules.cam.depthcam.Definitions import *
@@ -30,18 +31,22 @@ def get_stereo_config(do_color: bool) -> dai.RawStereoDepthConfig:
         stereoConfig.algorithmControl.depthAlign = dai.RawStereoDepthConfig.AlgorithmControl.DepthAlign.RECTIFIED_LEFT
     return stereoConfig
 
+@lru_cache(maxsize=None)
+def resolve_model_path(model_path: str, file_name: str) -> Path:
+    return (Path(model_path) / file_name).resolve().absolute()
+
 def get_model_path(model_path: str, square: bool, stereo: bool, simulate: bool) -> Path:
     if square:
         if stereo:
-            return (Path(model_path) / YOLOV8_SQUARE_5S).resolve().absolute()
+            return resolve_model_path(model_path, YOLOV8_SQUARE_5S)
         elif simulate:
-            return (Path(model_path) / YOLOV8_SQUARE_7S).resolve().absolute()
-        return (Path(model_path) / YOLOV8_SQUARE_6S).resolve().absolute()
+            return resolve_model_path(model_path, YOLOV8_SQUARE_7S)
+        return resolve_model_path(model_path, YOLOV8_SQUARE_6S)
     if stereo:
-        return (Path(model_path) / YOLOV8_WIDE_5S).resolve().absolute()
+        return resolve_model_path(model_path, YOLOV8_WIDE_5S)
     elif simulate:
-        return (Path(model_path) / YOLOV8_WIDE_7S).resolve().absolute()
-    return (Path(model_path) / YOLOV8_WIDE_6S).resolve().absolute()
+        return resolve_model_path(model_path, YOLOV8_WIDE_7S)
+    return resolve_model_path(model_path, YOLOV8_WIDE_6S)
 
 
 def setup_pipeline(
@@ -126,6 +131,22 @@ class Setup():
         self.pipeline: dai.Pipeline = pipeline
         self.fps: float = fps
 
+    def create_output(self, stream_name: str) -> dai.node.XLinkOut:
+        # drop stale frames on the device instead of buffering them for a slow host
+        output: dai.node.XLinkOut = self.pipeline.create(dai.node.XLinkOut)
+        output.setStreamName(stream_name)
+        output.setFpsLimit(self.fps)
+        output.input.setBlocking(False)
+        output.input.setQueueSize(XLINK_OUT_QUEUE_SIZE)
+        return output
+
+    def create_sync(self) -> dai.node.Sync:
+        # only for multi-stream setups, single streams link straight to their output
+        sync: dai.node.Sync = self.pipeline.create(dai.node.Sync)
+        sync.setSyncAttempts(-1)
+        sync.setSyncThreshold(timedelta(seconds=(1.0 / self.fps) * 0.5))
+        return sync
+
 class SetupColor(Setup):
     def __init__(self, pipeline : dai.Pipeline, fps: float, square: bool, perspective: PerspectiveConfig) -> None:
         super().__init__(pipeline, fps)
@@ -158,8 +179,7 @@ class SetupColor(Setup):
         self.color_warp.setWarpMesh(warp_mesh, mesh_w, mesh_h)
         self.color.preview.link(self.color_warp.inputImage)
 
-        self.output_video: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_video.setStreamName("video")
+        self.output_video: dai.node.XLinkOut = self.create_output("video")
         self.color_warp.out.link(self.output_video.input)
 
         self.color_control: dai.node.XLinkIn = pipeline.create(dai.node.XLinkIn)
@@ -199,8 +219,7 @@ class SetupColorYolo(SetupColor):
         self.detection_network.passthrough.link(self.object_tracker.inputDetectionFrame)
         self.detection_network.out.link(self.object_tracker.inputDetections)
 
-        self.outputTracklets: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.outputTracklets.setStreamName("tracklets")
+        self.outputTracklets: dai.node.XLinkOut = self.create_output("tracklets")
         self.object_tracker.out.link(self.outputTracklets.input)
 
 
@@ -239,10 +258,7 @@ class SetupColorStereo(SetupColor):
         self.left.out.link(self.stereo.left)
         self.right.out.link(self.stereo.right)
 
-        self.sync: dai.node.Sync = pipeline.create(dai.node.Sync)
-        sync_threshold = timedelta(seconds=(1.0 / self.fps) * 0.5)
-        self.sync.setSyncAttempts(-1)
-        self.sync.setSyncThreshold(sync_threshold)
+        self.sync: dai.node.Sync = self.create_sync()
 
         self.color.video.link(self.sync.inputs["video"])
         self.left.out.link(self.sync.inputs["left"])
@@ -250,8 +266,7 @@ class SetupColorStereo(SetupColor):
         if self.show_stereo:
             self.stereo.disparity.link(self.sync.inputs["stereo"])
 
-        self.output_sync: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_sync.setStreamName("sync")
+        self.output_sync: dai.node.XLinkOut = self.create_output("sync")
         self.sync.out.link(self.output_sync.input)
 
         self.mono_control: dai.node.XLinkIn = pipeline.create(dai.node.XLinkIn)
@@ -299,8 +314,7 @@ class SetupColorStereoYolo(SetupColorStereo):
         self.detection_network.passthrough.link(self.object_tracker.inputDetectionFrame)
         self.detection_network.out.link(self.object_tracker.inputDetections)
 
-        self.output_tracklets: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_tracklets.setStreamName("tracklets")
+        self.output_tracklets: dai.node.XLinkOut = self.create_output("tracklets")
         self.object_tracker.out.link(self.output_tracklets.input)
 
 
@@ -334,8 +348,7 @@ class SetupMono(Setup):
         self.left_warp.setWarpMesh(warp_mesh, mesh_w, mesh_h)
         self.left.out.link(self.left_warp.inputImage)
 
-        self.output_video: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_video.setStreamName("video")
+        self.output_video: dai.node.XLinkOut = self.create_output("video")
         self.left_warp.out.link(self.output_video.input)
 
         self.mono_control: dai.node.XLinkIn = pipeline.create(dai.node.XLinkIn)
@@ -375,8 +388,7 @@ class SetupMonoYolo(SetupMono):
         self.detection_network.passthrough.link(self.object_tracker.inputDetectionFrame)
         self.detection_network.out.link(self.object_tracker.inputDetections)
 
-        self.output_tracklets: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_tracklets.setStreamName("tracklets")
+        self.output_tracklets: dai.node.XLinkOut = self.create_output("tracklets")
         self.object_tracker.out.link(self.output_tracklets.input)
 
 
@@ -404,10 +416,7 @@ class SetupMonoStereo(SetupMono):
         self.left.out.link(self.stereo.left)
         self.right.out.link(self.stereo.right)
 
-        self.sync: dai.node.Sync = pipeline.create(dai.node.Sync)
-        sync_threshold = timedelta(seconds=(1.0 / self.fps) * 0.5)
-        self.sync.setSyncAttempts(-1)
-        self.sync.setSyncThreshold(sync_threshold)
+        self.sync: dai.node.Sync = self.create_sync()
 
         self.stereo.rectifiedLeft.link(self.sync.inputs["video"])
         self.left.out.link(self.sync.inputs["left"])
@@ -415,8 +424,7 @@ class SetupMonoStereo(SetupMono):
         if self.show_stereo:
             self.stereo.disparity.link(self.sync.inputs["stereo"])
 
-        self.output_sync: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_sync.setStreamName("sync")
+        self.output_sync: dai.node.XLinkOut = self.create_output("sync")
         self.sync.out.link(self.output_sync.input)
 
         self.mono_control.out.link(self.right.inputControl)
@@ -460,8 +468,7 @@ class SetupMonoStereoYolo(SetupMonoStereo):
         self.detection_network.passthrough.link(self.object_tracker.inputDetectionFrame)
         self.detection_network.out.link(self.object_tracker.inputDetections)
 
-        self.output_tracklets: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_tracklets.setStreamName("tracklets")
+        self.output_tracklets: dai.node.XLinkOut = self.create_output("tracklets")
         self.object_tracker.out.link(self.output_tracklets.input)
 
 
@@ -520,23 +527,19 @@ class SimulationColorStereo(SetupColorStereo):
         self.ex_left.out.link(self.stereo.left)
         self.ex_right.out.link(self.stereo.right)
 
-        self.output_video: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_video.setStreamName("video")
+        self.output_video: dai.node.XLinkOut = self.create_output("video")
         self.ex_video.out.link(self.output_video.input)
 
-        self.output_left: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_left.setStreamName("left")
+        self.output_left: dai.node.XLinkOut = self.create_output("left")
         self.ex_left.out.link(self.output_left.input)
         # self.stereo.syncedLeft.link(self.output_left.input)
 
-        self.output_right: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_right.setStreamName("right")
+        self.output_right: dai.node.XLinkOut = self.create_output("right")
         self.ex_right.out.link(self.output_right.input)
         # self.stereo.syncedRight.link(self.output_right.input)
 
         if self.show_stereo:
-            self.output_stereo: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-            self.output_stereo.setStreamName("stereo")
+            self.output_stereo: dai.node.XLinkOut = self.create_output("stereo")
             self.stereo.disparity.link(self.output_stereo.input)
 
 class SimulationColorStereoYolo(SimulationColorStereo):
@@ -575,8 +578,7 @@ class SimulationColorStereoYolo(SimulationColorStereo):
         self.detection_network.passthrough.link(self.object_tracker.inputDetectionFrame)
         self.detection_network.out.link(self.object_tracker.inputDetections)
 
-        self.trackerOut: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.trackerOut.setStreamName("tracklets")
+        self.trackerOut: dai.node.XLinkOut = self.create_output("tracklets")
         self.object_tracker.out.link(self.trackerOut.input)
 
         pipeline.remove(self.output_left)
@@ -648,21 +650,17 @@ class SimulationMonoStereo(SetupMonoStereo):
         self.ex_left.out.link(self.stereo.left)
         self.ex_right.out.link(self.stereo.right)
 
-        self.output_video: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_video.setStreamName("video")
+        self.output_video: dai.node.XLinkOut = self.create_output("video")
         self.ex_video.out.link(self.output_video.input)
 
-        self.output_left: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_left.setStreamName("left")
+        self.output_left: dai.node.XLinkOut = self.create_output("left")
         self.ex_left.out.link(self.output_left.input)
 
-        self.output_right: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_right.setStreamName("right")
+        self.output_right: dai.node.XLinkOut = self.create_output("right")
         self.ex_right.out.link(self.output_right.input)
 
         if self.show_stereo:
-            self.output_stereo: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-            self.output_stereo.setStreamName("stereo")
+            self.output_stereo: dai.node.XLinkOut = self.create_output("stereo")
             self.stereo.disparity.link(self.output_stereo.input)
 
 class SimulationMonoStereoYolo(SimulationMonoStereo):
@@ -701,8 +699,7 @@ class SimulationMonoStereoYolo(SimulationMonoStereo):
         self.detection_network.passthrough.link(self.object_tracker.inputDetectionFrame)
         self.detection_network.out.link(self.object_tracker.inputDetections)
 
-        self.output_tracklets: dai.node.XLinkOut = pipeline.create(dai.node.XLinkOut)
-        self.output_tracklets.setStreamName("tracklets")
+        self.output_tracklets: dai.node.XLinkOut = self.create_output("tracklets")
         self.object_tracker.out.link(self.output_tracklets.input)
 
         pipeline.remove(self.output_left)
@@ -3,7 +3,6 @@ import numpy as np
 from threading import Thread, Event, Lock
 from typing import Callable
 from enum import Enum
-from cv2 import cvtColor, COLOR_RGB2BGR
 import time
 
 
@@ -29,8 +28,10 @@ EndCallback = Callable[[int], None]
 
 class FFmpegPlayer:
     def __init__(self, cam_id: int, frameType: FrameType, frameCallback,
-                 hw_acceleration_type: str = '', hw_acceleration_device: str = '', fps: float = 0.0) -> None:
+                 hw_acceleration_type: str = '', hw_acceleration_device: str = '', fps: float = 0.0,
+                 endCallback: EndCallback | None = None) -> None:
         self.frame_callback = frameCallback
+        self.end_callback: EndCallback | None = endCallback
 
         self.cam_id: int = cam_id
         self.frame_type: FrameType = frameType
@@ -39,6 +40,7 @@ class FFmpegPlayer:
 
         self.ffmpeg_process = None
         self.bytes_per_frame: int = 0
+        self.frame_shape: tuple[int, ...] = ()
         self.frame_width: int = 0
         self.frame_height: int = 0
         self.frame_rate: float = fps
@@ -47,6 +49,7 @@ class FFmpegPlayer:
         self._load_thread: Thread | None = None
 
         self._play_thread: Thread | None = None
+        self._play_finished: bool = False
         self.stop_event = Event()
 
         self.chunk_id: int
@@ -61,6 +64,10 @@ class FFmpegPlayer:
     def is_playing(self) -> bool:
         return self._play_thread is not None and self._play_thread.is_alive()
 
+    def is_finished(self) -> bool:
+        # set when the last frame was played, the play thread may still be running the end callback
+        return self._play_finished
+
     def is_stopped(self) -> bool:
         return not self.is_loading() and not self.is_playing()
 
@@ -102,7 +109,12 @@ class FFmpegPlayer:
             self.ffmpeg_process = None
             return
 
-        pix_fmt: str = 'rgb24' if self.frame_type == FrameType.VIDEO else 'gray'
+        # let ffmpeg output bgr directly, so frames need no color conversion on the host
+        pix_fmt: str = 'bgr24' if self.frame_type == FrameType.VIDEO else 'gray'
+        if self.frame_type == FrameType.VIDEO:
+            self.frame_shape = (self.frame_height, self.frame_width, 3)
+        else:
+            self.frame_shape = (self.frame_height, self.frame_width)
         self.bytes_per_frame: int = self.frame_width * self.frame_height * (3 if self.frame_type == FrameType.VIDEO else 1)
 
         ffmpeg_process = None
@@ -142,21 +154,17 @@ class FFmpegPlayer:
 
         while not self.stop_event.is_set():
             start_time: float = time.time()
+            # a new array per frame, consumers keep references to previous frames
+            frame: np.ndarray = np.empty(self.frame_shape, np.uint8)
             try:
-                in_bytes = self.ffmpeg_process.stdout.read(self.bytes_per_frame)
-                if not in_bytes:
+                num_bytes: int = self.ffmpeg_process.stdout.readinto(frame)
+                if num_bytes < self.bytes_per_frame:
                     # print ('End of stream', self.frame_type)
                     break
             except ffmpeg.Error as e:
                 print('Error reading frame:', e)
                 break
 
-            if self.frame_type == FrameType.VIDEO:
-                frame: np.ndarray = np.frombuffer(in_bytes, np.uint8).reshape([self.frame_height, self.frame_width, 3])
-                frame = cvtColor(frame, COLOR_RGB2BGR)
-            else:
-                frame: np.ndarray = np.frombuffer(in_bytes, np.uint8).reshape([self.frame_height, self.frame_width])
-
             self.frame_callback(self.cam_id, self.frame_type, frame, self.chunk_id, frame_count)
             frame_count += 1
 
@@ -166,6 +174,9 @@ class FFmpegPlayer:
         self.ffmpeg_process.stdout.close()
         self.ffmpeg_process.terminate()
         self.ffmpeg_process = None
+        self._play_finished = True
+        if self.end_callback is not None:
+            self.end_callback(self.cam_id)
 
     def _get_video_dimensions(self, video_file: str) -> tuple:
         probe = ffmpeg.probe(video_file)
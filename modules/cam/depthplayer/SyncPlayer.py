@@ -1,3 +1,5 @@
+import os
+import re
 from threading import Thread, Event, Lock
 from pathlib import Path
 from numpy import ndarray
@@ -32,6 +34,11 @@ HwaccelDeviceString: dict[Settings.CoderType, str] = {
     Settings.CoderType.iGPU: '1'
 }
 
+# matches make_file_name output, captures the chunk index
+CHUNK_FILE_PATTERN: re.Pattern[str] = re.compile(
+    r'_(\d+)(?:' + '|'.join(re.escape(f.value) for f in Settings.CoderFormat) + r')$'
+)
+
 class MessageType(Enum):
     START = auto()
     STOP = auto()
@@ -62,6 +69,7 @@ class SyncPlayer(Thread):
         self.state_messages: Queue[Message] = Queue()
 
         self.stop_event = Event()
+        self.state_event = Event()
 
         self.play_chunk: int = -1
         self.load_chunk: int = -1
@@ -97,6 +105,7 @@ class SyncPlayer(Thread):
         message: Message = Message(MessageType.STOP)
         self.state_messages.put(message)
         self.stop_event.set()
+        self.state_event.set()
         self.join()
 
     def run(self) -> None:
@@ -139,15 +148,19 @@ class SyncPlayer(Thread):
             if self.stop_event.is_set() and state == State.IDLE:
                 self.running = False
 
-            sleep(0.01)
+            # woken early by messages and by players reaching the end of their chunk
+            self.state_event.wait(0.01)
+            self.state_event.clear()
 
     def _load(self) -> None:
         folder: Folder = self.folders[self.load_folder]
+        with self.playback_lock:
+            R0, R1 = self.chunk_range_0, self.chunk_range_1
         LC: int = self._get_load_chunk() + 1
-        LC = max(LC, self.chunk_range_0)
-        LC = min(LC, self.chunk_range_1 + 1)
-        if LC > self.chunk_range_1:
-            LC = self.chunk_range_0
+        LC = max(LC, R0)
+        LC = min(LC, R1 + 1)
+        if LC > R1:
+            LC = R0
 
         self._set_load_chunk(LC)
 
@@ -156,7 +169,7 @@ class SyncPlayer(Thread):
                 path: Path = folder.path / make_file_name(c, t, self.load_chunk, self.suffix)
                 if path.is_file():
 
-                    player: FFmpegPlayer = FFmpegPlayer(c, t, self._frame_sync_callback, self.hwt, self.hwd, self.fps)
+                    player: FFmpegPlayer = FFmpegPlayer(c, t, self._frame_sync_callback, self.hwt, self.hwd, self.fps, self._player_end_callback)
                     player.load(str(path), self.load_chunk)
                     self.loaders.append(player)
                 else:
@@ -189,28 +202,20 @@ class SyncPlayer(Thread):
         self.players.clear()
 
     def _clean(self) -> None:
-        for p in self.closers:
+        for p in list(self.closers):
             if p.is_stopped():
                 p.join()
                 self.closers.remove(p)
 
     def _finished_loading(self) -> bool:
-        for p in self.loaders:
-            if not p.is_loaded():
-                return False
-        return True
+        return all(p.is_loaded() for p in self.loaders)
 
     def _finished_playing(self) -> bool:
-        for p in self.players:
-            if p.is_playing():
-                return False
-        return True
+        # an empty player list counts as finished, so chunks without files are skipped
+        return all(p.is_finished() or not p.is_playing() for p in self.players)
 
     def _finished_stopping(self) -> bool:
-        for p in self.closers:
-            if not p.is_stopped():
-                return False
-        return True
+        return all(p.is_stopped() for p in self.closers)
 
     # FRAME CALLBACK
     def _frame_sync_callback(self, cam_id: int, frame_type: FrameType, frame: ndarray, chunk_id: int, frame_id: int) -> None:
@@ -251,6 +256,9 @@ class SyncPlayer(Thread):
             for callback in self.frameCallbacks:
                 callback(cam_id, ft, sync_frames[ft])
 
+    def _player_end_callback(self, cam_id: int) -> None:
+        self.state_event.set()
+
     def _clear_frame_sync(self) -> None:
         with self.sync_lock:
             for i in range(self.num_cams):
@@ -288,29 +296,24 @@ class SyncPlayer(Thread):
             self.drift = 0
 
     # GETTERS AND SETTERS
+    # single attribute loads and stores are atomic, the play chunk is read for every frame
     def _set_load_chunk(self, value: int) -> None:
-        with self.playback_lock:
-            self.load_chunk = value
+        self.load_chunk = value
 
     def _get_load_chunk(self) -> int:
-        with self.playback_lock:
-            return self.load_chunk
+        return self.load_chunk
 
     def _set_play_chunk(self, value: int) -> None:
-        with self.playback_lock:
-            self.play_chunk = value
+        self.play_chunk = value
 
     def _get_play_chunk(self) -> int:
-        with self.playback_lock:
-            return self.play_chunk
+        return self.play_chunk
 
     def _set_load_folder(self, value: str) -> None:
-        with self.playback_lock:
-            self.load_folder = value
+        self.load_folder = value
 
     def _get_load_folder(self) -> str:
-        with self.playback_lock:
-            return self.load_folder
+        return self.load_folder
 
     # EXTERNAL METHODS
     def play(self, value: bool, name: str = '') -> None:
@@ -324,6 +327,7 @@ class SyncPlayer(Thread):
 
         self.num_chunks = self.get_num_folder_chunks(name)
         self.state_messages.put(message)
+        self.state_event.set()
 
     def get_folder_names(self) -> list[str]:
         return list(self.folders.keys())
@@ -371,11 +375,11 @@ class SyncPlayer(Thread):
                 if not is_folder_for_settings(str(folder), settings):
                     continue
                 max_chunk: int = -1
-                for file in folder.iterdir():
-                    if file.is_file() and (file.name.endswith(Settings.CoderFormat.H264.value) or file.name.endswith(Settings.CoderFormat.H265.value)):
-                        n: str = file.stem.split('_')[2]
-                        if n.isdigit():
-                            max_chunk = max(max_chunk, int(n))
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        match: re.Match[str] | None = CHUNK_FILE_PATTERN.search(entry.name)
+                        if match and entry.is_file():
+                            max_chunk = max(max_chunk, int(match.group(1)))
                 if max_chunk >= 0:
                     folders[folder.name] = (Folder(folder.name, folder, max_chunk))
         return folders
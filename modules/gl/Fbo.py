@@ -1,4 +1,5 @@
 from OpenGL.GL import * # type: ignore
+from modules.gl.RenderBase import invalidate_view
 from modules.gl.Texture import Texture
 
 class Fbo(Texture):
@@ -24,6 +25,7 @@ class Fbo(Texture):
 
     def begin(self)  -> None:
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo_id)
+        invalidate_view()
         # Apply transformation to flip the y-coordinates
         # glPushMatrix()
         # glTranslatef(0, self.height, 0)
@@ -32,6 +34,7 @@ class Fbo(Texture):
     def end(self)  -> None:
         # glPopMatrix()
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        invalidate_view()
 
 class SwapFbo():
     def __init__(self) -> None :
@@ -69,9 +72,11 @@ class SwapFbo():
 
     def begin(self) -> None :
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo_id)
+        invalidate_view()
 
     def end(self) -> None :
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        invalidate_view()
 
     def bind(self) -> None :
         glBindTexture(GL_TEXTURE_2D, self.tex_id)
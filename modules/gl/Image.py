@@ -1,5 +1,6 @@
 from OpenGL.GL import * # type: ignore
-from modules.gl.Texture import Texture, draw_quad
+from modules.gl.Texture import Texture, draw_quad, get_internal_format
+import ctypes
 import numpy as np
 from threading import Lock
 
@@ -10,6 +11,17 @@ class Image(Texture):
         self._needs_update: bool = False
         self._mutex: Lock = Lock()
 
+        # pixel unpack buffer, orphaned on every write so a new frame never waits on the previous upload
+        self._pbo: int = 0
+        self._pbo_size: int = 0
+
+    def deallocate(self) -> None: #override
+        if self._pbo:
+            glDeleteBuffers(1, [self._pbo])
+            self._pbo = 0
+            self._pbo_size = 0
+        super().deallocate()
+
     def set_image(self, image: np.ndarray) -> None:
         with self._mutex:
             self._image = image
@@ -26,6 +38,38 @@ class Image(Texture):
         if needs_update and image is not None:
             self.set_from_image(image)
 
+    def set_from_image(self, image: np.ndarray) -> None: #override
+        internal_format: Constant = get_internal_format(image)
+        if internal_format == GL_NONE: return
+        height: int = image.shape[0]
+        width:  int = image.shape[1]
+
+        if internal_format != self.internal_format or width != self.width or height != self.height:
+            if self.allocated: super().deallocate()
+            self.allocate(width, height, internal_format)
+
+        if not self.allocated: return
+
+        image = np.ascontiguousarray(image)
+        nbytes: int = image.nbytes
+        if not self._pbo:
+            self._pbo = int(glGenBuffers(1))
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, self._pbo)
+        if nbytes != self._pbo_size:
+            glBufferData(GL_PIXEL_UNPACK_BUFFER, nbytes, None, GL_STREAM_DRAW)
+            self._pbo_size = nbytes
+
+        # copy the frame into the buffer, the texture upload from it is done by the driver asynchronously
+        # invalidating the buffer gives fresh storage while the driver may still read the previous frame
+        ptr = glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, nbytes, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT)
+        if ptr:
+            ctypes.memmove(ptr, image.ctypes.data, nbytes)
+            glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+            self.bind()
+            glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, width, height, self.format, self.data_type, ctypes.c_void_p(0))
+            self.unbind()
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+
     def draw(self, x, y, w, h) -> None : #override
         self.bind()
         draw_quad(x, y, w, h, True)
@@ -1,12 +1,54 @@
 from OpenGL.GL import *  # type: ignore
+import ctypes
 import numpy as np
 from threading import Lock
 
+def upload_buffer(target: Constant, buffer: int, data: np.ndarray, capacity: int) -> int:
+    """ Upload data into a buffer object and return its capacity in bytes.
+        A buffer that is large enough is orphaned and written through an unsynchronized mapping,
+        so the upload never waits for draws that still use the previous contents
+    """
+    data = np.ascontiguousarray(data)
+    glBindBuffer(target, buffer)
+    if data.nbytes > capacity or capacity == 0:
+        glBufferData(target, data.nbytes, data, GL_DYNAMIC_DRAW)
+        capacity = data.nbytes
+    else:
+        ptr = glMapBufferRange(target, 0, data.nbytes, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT | GL_MAP_UNSYNCHRONIZED_BIT)
+        if ptr:
+            ctypes.memmove(ptr, data.ctypes.data, data.nbytes)
+            glUnmapBuffer(target)
+        else:
+            glBufferSubData(target, 0, data.nbytes, data)
+    glBindBuffer(target, 0)
+    return capacity
+
+def interleave(vertices: np.ndarray, colors: np.ndarray | None) -> np.ndarray:
+    """ Pack xyz positions and rgba colors into one array of structs, colors are left out when they do not match the vertices """
+    if colors is None or len(colors) != len(vertices):
+        dtype = np.dtype([('position', np.float32, 3)])
+    else:
+        # uint8 colors stay normalized bytes, anything else is packed as float32 to match the GL_FLOAT color pointer
+        if colors.dtype != np.uint8:
+            colors = colors.astype(np.float32, copy=False)
+        dtype = np.dtype([('position', np.float32, 3), ('color', colors.dtype, 4)])
+    data: np.ndarray = np.empty(len(vertices), dtype=dtype)
+    data['position'] = vertices
+    if 'color' in dtype.names:
+        data['color'] = colors
+    return data
+
 class Mesh:
     def __init__(self) -> None:
         self.vertex_buffer: int =           0
         self.index_buffer: int =            0
-        self.color_buffer: int =            0
+
+        self.vertex_capacity: int =         0
+        self.index_capacity: int =          0
+
+        # layout of the interleaved vertex buffer, set on upload
+        self.vertex_stride: int =           0
+        self.color_type: Constant | None =  None
 
         self.vertices: np.ndarray | None =  None
         self.indices: np.ndarray | None =   None
@@ -16,6 +58,10 @@ class Mesh:
         self.update_indices: bool =         False
         self.update_colors: bool =          False
 
+        # bumped by every setter that changes data, update() returns early when it has already uploaded this version
+        self._version: int =                0
+        self._uploaded_version: int =       0
+
         self.allocated =                    False
 
         self._mutex: Lock = Lock()
@@ -23,7 +69,8 @@ class Mesh:
     def allocate(self) -> None:
         self.vertex_buffer =                glGenBuffers(1)
         self.index_buffer =                 glGenBuffers(1)
-        self.color_buffer =                 glGenBuffers(1)
+        self.vertex_capacity =              0
+        self.index_capacity =               0
 
         self.allocated =                    True
 
@@ -38,18 +85,15 @@ class Mesh:
             glDeleteBuffers(1, [self.vertex_buffer])
         if self.index_buffer:
             glDeleteBuffers(1, [self.index_buffer])
-        if self.color_buffer:
-            glDeleteBuffers(1, [self.color_buffer])
 
 
     def bind(self) -> None:
-        if self.vertices is not None:
+        if self.vertex_stride:
             glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
-            glVertexPointer(3, GL_FLOAT, 0, None)
-
-        if self.colors is not None:
-            glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
-            glColorPointer(4, GL_FLOAT, 0, None)
+            glVertexPointer(3, GL_FLOAT, self.vertex_stride, ctypes.c_void_p(0))
+            if self.color_type is not None:
+                # colors follow the xyz position, uint8 colors are normalized to 0..1 by the pipeline
+                glColorPointer(4, self.color_type, self.vertex_stride, ctypes.c_void_p(12))
 
         if self.indices is not None:
             glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
@@ -68,7 +112,7 @@ class Mesh:
         self.bind()
 
         glEnableClientState(GL_VERTEX_ARRAY)
-        if self.colors is not None:
+        if self.color_type is not None:
             glEnableClientState(GL_COLOR_ARRAY)
 
         glPushMatrix()
@@ -82,7 +126,7 @@ class Mesh:
         glPopMatrix()
 
         glDisableClientState(GL_VERTEX_ARRAY)
-        if self.colors is not None:
+        if self.color_type is not None:
             glDisableClientState(GL_COLOR_ARRAY)
 
         self.unbind()
@@ -91,35 +135,37 @@ class Mesh:
         if not self.allocated:
             self.allocate()
 
-        with self._mutex:
+        if self._version == self._uploaded_version:
+            return
 
-            if self.update_vertices and self.vertices is not None:
-                glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
-                glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
-                glBindBuffer(GL_ARRAY_BUFFER, 0)
+        with self._mutex:
+            self._uploaded_version = self._version
+
+            # vertices and colors share one interleaved buffer, a change to either uploads both in one go
+            if (self.update_vertices or self.update_colors) and self.vertices is not None:
+                data: np.ndarray = interleave(self.vertices, self.colors)
+                self.vertex_capacity = upload_buffer(GL_ARRAY_BUFFER, self.vertex_buffer, data, self.vertex_capacity)
+                self.vertex_stride = data.dtype.itemsize
+                self.color_type = None
+                if 'color' in data.dtype.names:
+                    self.color_type = GL_UNSIGNED_BYTE if self.colors.dtype == np.uint8 else GL_FLOAT
                 self.update_vertices = False
+                self.update_colors = False
 
             if self.update_indices and self.indices is not None:
-                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
-                glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
-                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+                self.index_capacity = upload_buffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer, self.indices, self.index_capacity)
                 self.update_indices = False
 
-            if self.update_colors and self.colors is not None:
-                glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
-                glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, self.colors, GL_STATIC_DRAW)
-                glBindBuffer(GL_ARRAY_BUFFER, 0)
-                self.update_colors = False
-
 
     def set_vertices(self, vertices: np.ndarray) -> None:
         if vertices.shape[1] == 2:
             vertices = np.concatenate((vertices, np.zeros((vertices.shape[0], 1), dtype=np.float32)), axis=1)
-        if self.vertices is not None and np.array_equal(self.vertices, vertices):
+        if self.vertices is not None and np.array_equal(self.vertices, vertices, equal_nan=True):
             return
         with self._mutex:
             self.update_vertices = True
             self.vertices = vertices
+            self._version += 1
 
     def set_indices(self, indices: np.ndarray) -> None:
         if self.indices is not None and np.array_equal(self.indices, indices):
@@ -127,15 +173,17 @@ class Mesh:
         with self._mutex:
             self.update_indices = True
             self.indices = indices.astype(np.uint32)
+            self._version += 1
 
     def set_colors(self, colors: np.ndarray) -> None:
         if colors.ndim == 1:
             colors = np.repeat(colors[:, np.newaxis], 4, axis=1)
-        if self.colors is not None and np.array_equal(self.colors, colors):
+        if self.colors is not None and np.array_equal(self.colors, colors, equal_nan=True):
             return
         with self._mutex:
             self.update_colors = True
             self.colors = colors
+            self._version += 1
 
     def isInitialized(self) -> bool:
         return self.allocated and self.vertices is not None and self.indices is not None
@@ -0,0 +1,81 @@
+from OpenGL.GL import *  # type: ignore
+import numpy as np
+
+# corner order of each quad, as offsets of (x, y, width, height): bottom left, bottom right, top right, top left
+QUAD_CORNERS_X: np.ndarray = np.array([0.0, 0.0, 1.0, 1.0], dtype=np.float32)
+QUAD_CORNERS_Y: np.ndarray = np.array([0.0, 1.0, 1.0, 0.0], dtype=np.float32)
+
+class RectangleBatch:
+    """Draws any number of coloured rectangles with one upload and one draw call"""
+    def __init__(self, capacity: int = 32) -> None:
+        self.capacity: int = capacity
+        self.vertex_buffer: int = 0
+        self.color_buffer: int = 0
+        self.vertices: np.ndarray = np.zeros((capacity * 4, 3), dtype=np.float32)
+        self.colors: np.ndarray = np.zeros((capacity * 4, 4), dtype=np.float32)
+        self.allocated: bool = False
+
+    def allocate(self) -> None:
+        if self.allocated:
+            return
+        self.vertex_buffer = glGenBuffers(1)
+        self.color_buffer = glGenBuffers(1)
+        self._allocate_buffers()
+        self.allocated = True
+
+    def deallocate(self) -> None:
+        if not self.allocated:
+            return
+        glDeleteBuffers(2, [self.vertex_buffer, self.color_buffer])
+        self.vertex_buffer = 0
+        self.color_buffer = 0
+        self.allocated = False
+
+    def _allocate_buffers(self) -> None:
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _reserve(self, count: int) -> None:
+        if count <= self.capacity:
+            return
+        while self.capacity < count:
+            self.capacity *= 2
+        self.vertices = np.zeros((self.capacity * 4, 3), dtype=np.float32)
+        self.colors = np.zeros((self.capacity * 4, 4), dtype=np.float32)
+        if self.allocated:
+            self._allocate_buffers()
+
+    def draw(self, rects: np.ndarray, colors: np.ndarray) -> None:
+        """rects is (N, 4) as x, y, width, height, colors is (N, 4) as r, g, b, a"""
+        count: int = len(rects)
+        if count == 0:
+            return
+        self._reserve(count)
+        if not self.allocated:
+            self.allocate()
+
+        num_vertices: int = count * 4
+        vertices: np.ndarray = self.vertices[:num_vertices].reshape(count, 4, 3)
+        vertices[:, :, 0] = rects[:, 0:1] + rects[:, 2:3] * QUAD_CORNERS_X
+        vertices[:, :, 1] = rects[:, 1:2] + rects[:, 3:4] * QUAD_CORNERS_Y
+        self.colors[:num_vertices].reshape(count, 4, 4)[:] = colors[:, np.newaxis, :]
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, num_vertices * 3 * 4, self.vertices)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, num_vertices * 4 * 4, self.colors)
+        glColorPointer(4, GL_FLOAT, 0, None)
+
+        glDrawArrays(GL_QUADS, 0, num_vertices)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glDisableClientState(GL_COLOR_ARRAY)
@@ -2,6 +2,27 @@ from abc import ABC, abstractmethod
 
 from OpenGL.GL import * # type: ignore
 
+# size of the view last set in the current context, repeated sizes skip the GL calls
+_current_view: tuple[int, int] | None = None
+
+def set_view(width, height) -> None:
+    global _current_view
+    if _current_view == (width, height):
+        return
+    _current_view = (width, height)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(0, width, height, 0, -1, 1)
+
+    glMatrixMode(GL_MODELVIEW)
+    glViewport(0, 0, width, height)
+
+def invalidate_view() -> None:
+    """ Forget the cached view. Call this after a context switch, every context has its own projection and viewport,
+        after binding a framebuffer, and after any glViewport or projection change made outside set_view """
+    global _current_view
+    _current_view = None
+
 class RenderBase(ABC):
     @abstractmethod
     def allocate(self) -> None: ...
@@ -16,9 +37,4 @@ class RenderBase(ABC):
 
 
     def setView(self, width, height) -> None:
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, width, height, 0, -1, 1)
-
-        glMatrixMode(GL_MODELVIEW)
-        glViewport(0, 0, width, height)
\ No newline at end of file
+        set_view(width, height)
\ No newline at end of file
@@ -1,34 +1,65 @@
+from functools import lru_cache
+
 import OpenGL.GL as gl
 import OpenGL.GLUT as glut
 
 _glut_inited = False
 
+# display list base and glyph widths per font (keyed by big), built on first use when a GL context is current
+_font_cache: dict[bool, tuple[int, list[int]]] = {}
+
 def text_init() -> None:
     global _glut_inited
     if not _glut_inited:
         glut.glutInit()
         _glut_inited = True
 
+def _get_font(big: bool) -> tuple[int, list[int]]:
+    cached: tuple[int, list[int]] | None = _font_cache.get(big)
+    if cached is None:
+        font=glut.GLUT_BITMAP_HELVETICA_12 # type: ignore
+        if big:
+            font = glut.GLUT_BITMAP_HELVETICA_18 # type: ignore
+        # one display list per character code, so a whole string is drawn with a single glCallLists
+        base: int = gl.glGenLists(256)
+        for c in range(256):
+            gl.glNewList(base + c, gl.GL_COMPILE)
+            glut.glutBitmapCharacter(font, c)
+            gl.glEndList()
+        widths: list[int] = [glut.glutBitmapWidth(font, c) for c in range(256)]
+        cached = (base, widths)
+        _font_cache[big] = cached
+    return cached
+
+@lru_cache(maxsize=1024)
+def _layout_string(string: str, big: bool) -> tuple[bytes, int]:
+    # labels mostly repeat from frame to frame, so the encoded bytes and pixel width are kept per string
+    _, widths = _get_font(big)
+    data: bytes = string.encode('latin-1', 'replace')
+    return data, sum([widths[c] for c in data])
+
+def _call_string(base: int, data: bytes) -> None:
+    gl.glListBase(base)
+    gl.glCallLists(data)
+    # list base is global state, reset it so other glCallLists users are not offset
+    gl.glListBase(0)
+
 def draw_string(x: float, y: float, string: str, color: tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0), big: bool = False)-> None:
-    font=glut.GLUT_BITMAP_HELVETICA_12 # type: ignore
-    if big:
-        font = glut.GLUT_BITMAP_HELVETICA_18 # type: ignore
+    base, _ = _get_font(big)
     gl.glColor4f(*color)
     gl.glRasterPos2f(x, y)
-    for character in string:
-        glut.glutBitmapCharacter(font, ord(character))
+    _call_string(base, _layout_string(string, big)[0])
     gl.glRasterPos2f(0, 0)
     gl.glColor4f(1.0, 1.0, 1.0, 1.0)
 
 def draw_box_string(x: float, y: float, string: str, color: tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0), box_color: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.6), big: bool = False)-> None: # type: ignore
-    font=glut.GLUT_BITMAP_HELVETICA_12 # type: ignore
+    base, _ = _get_font(big)
     height = 12
     expand = 2
     if big:
-        font = glut.GLUT_BITMAP_HELVETICA_18 # type: ignore
         height = 18  # GLUT_BITMAP_HELVETICA_18 is approx 18 pixels high
         expand = 3
-    width: int = sum([glut.glutBitmapWidth(font, ord(c)) for c in string])
+    data, width = _layout_string(string, big)
     # Draw black rectangle behind text
     gl.glColor4f(*box_color)  # semi-transparent black
     gl.glBegin(gl.GL_QUADS)
@@ -39,8 +70,6 @@ def draw_box_string(x: float, y: float, string: str, color: tuple[float, float,
     gl.glEnd()
     gl.glColor4f(*color)
     gl.glRasterPos2f(x, y)
-    for character in string:
-        glut.glutBitmapCharacter(font, ord(character))
+    _call_string(base, data)
     gl.glRasterPos2f(0, 0)
     gl.glColor4f(1.0, 1.0, 1.0, 1.0)
-
@@ -169,8 +169,9 @@ class Texture():
 
         if not self.allocated: return
 
+        # storage is allocated above, only the pixels have to be replaced
         self.bind()
-        glTexImage2D(GL_TEXTURE_2D, 0, self.internal_format, width, height, 0, self.format, self.data_type, image)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, width, height, self.format, self.data_type, image)
         self.unbind()
 
     def bind(self) -> None :
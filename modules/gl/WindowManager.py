@@ -9,7 +9,7 @@ from typing import Callable, Optional
 import glfw
 
 # Local application imports
-from modules.gl.RenderBase import RenderBase
+from modules.gl.RenderBase import RenderBase, invalidate_view
 from modules.gl.Utils import FpsCounter
 
 
@@ -236,6 +236,7 @@ class WindowManager():
 
         glfw.make_context_current(self.main_window)
         glfw.swap_interval(1 if self.v_sync else 0)
+        invalidate_view()
 
         try:
             self.renderer.draw_main(self.window_width, self.window_height)
@@ -313,6 +314,7 @@ class WindowManager():
         width, height = glfw.get_window_size(window)
 
         glfw.make_context_current(window)  # <-- Make this window's context current
+        invalidate_view()
         glfw.swap_interval(0)
         try:
             self.renderer.draw_secondary(monitor_id, width, height)
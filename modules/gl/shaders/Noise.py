@@ -1,11 +1,16 @@
 from OpenGL.GL import * # type: ignore
 from modules.gl.Shader import Shader, draw_quad
-from random import random
 
 class Noise(Shader):
     def __init__(self) -> None:
         super().__init__()
         self.shader_name = self.__class__.__name__
+        self.frame: int = 0
+        # uniform locations and last uploaded resolution, refreshed when the program is (re)loaded
+        self.uniform_program = None
+        self.loc_frame: int = -1
+        self.loc_resolution: int = -1
+        self.resolution: tuple[float, float] | None = None
 
     def allocate(self, monitor_file = False) -> None:
         super().allocate(self.shader_name, monitor_file)
@@ -17,8 +22,18 @@ class Noise(Shader):
 
         s = self.shader_program
         glUseProgram(s)
-        glUniform1f(glGetUniformLocation(s, "random"), random())
-        glUniform2f(glGetUniformLocation(s, "resolution"), width, height)
+        if self.uniform_program != s:
+            self.uniform_program = s
+            self.loc_frame = glGetUniformLocation(s, "frame")
+            self.loc_resolution = glGetUniformLocation(s, "resolution")
+            self.resolution = None
+
+        # the seed is hashed from the frame counter in the shader
+        self.frame = (self.frame + 1) & 0xFFFF
+        glUniform1ui(self.loc_frame, self.frame)
+        if self.resolution != (width, height):
+            self.resolution = (width, height)
+            glUniform2f(self.loc_resolution, width, height)
 
         glBindFramebuffer(GL_FRAMEBUFFER, fbo)
         draw_quad()
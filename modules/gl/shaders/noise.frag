@@ -1,6 +1,6 @@
 #version 460 core
 
-uniform float random;
+uniform uint  frame;
 uniform vec2  resolution;
 
 in vec2 texCoord;
@@ -13,7 +13,7 @@ float hash(vec2 p) {
 }
 
 void main() {
-    float r = random;
+    float r = hash(vec2(float(frame), 0.5));
     vec2 position = texCoord * resolution;
     vec2 pos = (position * 0.152 + r * 15000. + 50.0);
     float x = hash(pos.xy);
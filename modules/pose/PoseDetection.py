@@ -18,7 +18,6 @@ from mmpose.structures import PoseDataSample
 from mmengine.dataset import Compose, pseudo_collate
 from mmengine.registry import init_default_scope
 from mmpose.structures import PoseDataSample
-from mmpose.structures.bbox import bbox_xywh2xyxy
 
 # Local application imports
 from modules.pose.Pose import Pose, PosePointData
@@ -34,6 +33,12 @@ from modules.utils.HotReloadMethods import HotReloadMethods
 POSE_MODEL_WIDTH = 192
 POSE_MODEL_HEIGHT = 256
 
+# crops are made at the model size and the bbox always covers the whole crop, so these are shared by all samples
+POSE_CROP_BBOX: np.ndarray = np.array([[0, 0, POSE_MODEL_WIDTH, POSE_MODEL_HEIGHT]], dtype=np.float32)
+POSE_CROP_BBOX.setflags(write=False)
+POSE_CROP_BBOX_SCORE: np.ndarray = np.ones(1, dtype=np.float32)
+POSE_CROP_BBOX_SCORE.setflags(write=False)
+
 class PoseModelType(IntEnum):
     NONE =   0
     LARGE =  1
@@ -59,8 +64,8 @@ class PoseDetection(Thread):
             print('Pose Detection WARNING: ModelType is NONE')
         self.model_config_file: str = path + '/' + POSE_MODEL_FILE_NAMES[model_type.value][0]
         self.model_checkpoint_file: str = path + '/' + POSE_MODEL_FILE_NAMES[model_type.value][1]
-        self.model_width: int = 192
-        self.model_height: int = 256
+        self.model_width: int = POSE_MODEL_WIDTH
+        self.model_height: int = POSE_MODEL_HEIGHT
         self.model_warmup: int = model_warmup
         self.confidence_threshold: float = confidence_threshold
 
@@ -71,9 +76,14 @@ class PoseDetection(Thread):
         self._running: bool = False
 
         self._poses_dict: dict[int, Pose] = {}
+        self._samples_dict: dict[int, dict] = {}
         self._poses_timestamp: dict[int, Timestamp] = {}
         self._poses_lock: Lock = Lock()  # Add lock for thread safety
         self._callbacks: set = set()
+        self._callbacks_snapshot: tuple = ()  # rebuilt on change, iterated on dispatch
+
+        self._pipeline: Compose | None = None
+        self._dataset_meta: dict = {}
 
         self._notify_update_event: Event = Event()
 
@@ -99,22 +109,29 @@ class PoseDetection(Thread):
     def run(self) -> None:
         model:torch.nn.Module = init_model(self.model_config_file, self.model_checkpoint_file, device='cuda:0')
         model.half()
+        # the registry scope only has to be set once, not for every batch
+        scope = model.cfg.get('default_scope', 'mmpose') # pyright: ignore
+        if scope is not None:
+            init_default_scope(scope)
         pipeline: Compose = Compose(model.cfg.test_dataloader.dataset.pipeline) # pyright: ignore
 
         self._model_warmup(model, pipeline, self.model_warmup, self.verbose)
 
+        # crops are preprocessed by the thread that adds them, this thread only runs the model
+        self._pipeline = pipeline
+        self._dataset_meta = model.dataset_meta # pyright: ignore
         self._running = True
 
         while self._running:
             self._notify_update_event.wait(timeout=1.0)
             self._notify_update_event.clear()
+            poses, samples = self._consume_pending()
+            if not poses:
+                continue
             start_time: float = time.perf_counter()
 
             try:
-                poses: list[Pose] = self.get_poses(consume=True)
-                images: list[np.ndarray] = [pose.crop_image for pose in poses if pose.crop_image is not None]
-
-                data_samples: list[list[PoseDataSample]] = PoseDetection._run_inference(model, pipeline, images, False)
+                data_samples: list[list[PoseDataSample]] = PoseDetection._run_batch(model, samples, False)
                 point_data_list: list[PosePointData | None] = PoseDetection._extract_point_data_from_samples(data_samples, self.model_width, self.model_height, self.confidence_threshold)
 
                 updated_poses: list[Pose] = [replace(pose, point_data=point_data_list[i]) for i, pose in enumerate(poses)]
@@ -133,7 +150,8 @@ class PoseDetection(Thread):
 
     # GETTERS AND SETTERS
     def add_pose(self, pose: Pose) -> None:
-        if self._running and pose.tracklet.id is not None:
+        if self._running and self._pipeline is not None and pose.tracklet.id is not None and pose.crop_image is not None:
+            sample: dict = PoseDetection._prepare_sample(self._pipeline, self._dataset_meta, pose.crop_image)
             with self._poses_lock:
                 if self._poses_dict.get(pose.tracklet.id) is not None:
                     existing_pose: Pose = self._poses_dict[pose.tracklet.id]
@@ -145,14 +163,19 @@ class PoseDetection(Thread):
                         print(f"Pose Detection Warning: Pose ID {pose.tracklet.id} already in queue, skipping last. {diff1:.3f}, {diff2:.3f}")
 
                 self._poses_dict[pose.tracklet.id] = pose
+                self._samples_dict[pose.tracklet.id] = sample
                 self._poses_timestamp[pose.tracklet.id] = Timestamp.now()
 
-    def get_poses(self, consume: bool) -> list[Pose]:
+    def _consume_pending(self) -> tuple[list[Pose], list[dict]]:
+        # the update event fires every camera frame, skip the lock when nothing was added since the last batch
+        if not self._poses_dict:
+            return [], []
         with self._poses_lock:
-            poses: dict[int, Pose] = self._poses_dict.copy()
-            if consume:
-                self._poses_dict = {}
-            return list(poses.values())
+            poses: dict[int, Pose] = self._poses_dict
+            samples: dict[int, dict] = self._samples_dict
+            self._poses_dict = {}
+            self._samples_dict = {}
+        return list(poses.values()), [samples[tracklet_id] for tracklet_id in poses]
 
     def notify_update(self) -> None:
         if self._running:
@@ -169,7 +192,7 @@ class PoseDetection(Thread):
                 pose_list: list[Pose] = self._callback_queue.get(timeout=0.5)
 
                 for pose in pose_list:
-                    for c in self._callbacks:
+                    for c in self._callbacks_snapshot:
                         try:
                             c(pose)
                         except Exception as e:
@@ -181,9 +204,11 @@ class PoseDetection(Thread):
 
     def addMessageCallback(self, callback) -> None:
         self._callbacks.add(callback)
+        self._callbacks_snapshot = tuple(self._callbacks)
 
     def clearMessageCallbacks(self) -> None:
         self._callbacks = set()
+        self._callbacks_snapshot = ()
 
     # STATIC METHODS
     @staticmethod
@@ -208,129 +233,66 @@ class PoseDetection(Thread):
 
 
     @staticmethod
-    def _run_inference(model: torch.nn.Module, pipeline: Compose, imgs: list[np.ndarray], verbose: bool) -> list[list[PoseDataSample]]:
-        if not imgs:
-            return []
-        with torch.cuda.amp.autocast(): # pyright: ignore
-
-            start_time = time.perf_counter()
-
-            scope = model.cfg.get('default_scope', 'mmpose') # pyright: ignore
-            if scope is not None:
-                init_default_scope(scope)
-            # pipeline = Compose(model.cfg.test_dataloader.dataset.pipeline)
-
-            bboxes = [None] * len(imgs)
-
-            # Process each image and its bboxes to create data samples
-            data_list = []
-            img_lengths = []  # Track number of data samples per image
-
-            for img_idx, (img, img_bboxes) in enumerate(zip(imgs, bboxes)):
-                h, w = img.shape[:2]
-
-                # Handle bboxes for this image
-                if img_bboxes is None or len(img_bboxes) == 0:
-                    img_bboxes = np.array([[0, 0, w, h]], dtype=np.float32)
-                else:
-                    if isinstance(img_bboxes, list):
-                        img_bboxes = np.array(img_bboxes)
-
-                    img_bboxes = bbox_xywh2xyxy(img_bboxes)
-
-                # Create data samples for each bbox in this image
-                for bbox in img_bboxes:
-                    data_info = dict(img=img)
-                    data_info['bbox'] = bbox[None]  # shape (1, 4)
-                    data_info['bbox_score'] = np.ones(1, dtype=np.float32)
-                    data_info.update(model.dataset_meta) # pyright: ignore
-                    data_list.append(pipeline(data_info))
-
-                img_lengths.append(len(img_bboxes))
-
-            results_by_image = []
+    def _prepare_sample(pipeline: Compose, dataset_meta: dict, img: np.ndarray) -> dict:
+        """Run the test pipeline on a single crop, the bbox covers the whole crop"""
+        h, w = img.shape[:2]
+        data_info: dict = dict(img=img)
+        if w == POSE_MODEL_WIDTH and h == POSE_MODEL_HEIGHT:
+            data_info['bbox'] = POSE_CROP_BBOX
+        else:
+            data_info['bbox'] = np.array([[0, 0, w, h]], dtype=np.float32)
+        data_info['bbox_score'] = POSE_CROP_BBOX_SCORE
+        data_info.update(dataset_meta)
+        return pipeline(data_info)
 
-            if data_list:
-                # Process all images in a single batch
-                batch = pseudo_collate(data_list)
+    @staticmethod
+    def _run_batch(model: torch.nn.Module, data_list: list[dict], verbose: bool) -> list[list[PoseDataSample]]:
+        if not data_list:
+            return []
 
+        start_time = time.perf_counter()
 
-                start_time = time.perf_counter()
-                with torch.no_grad():
-                    all_results = model.test_step(batch) # pyright: ignore
-                    end_time = time.perf_counter()
-                    # print(f"Pose Detection: Inference time: {end_time - start_time:.4f} seconds")
+        # Process all samples in a single batch
+        batch = pseudo_collate(data_list)
+        with torch.cuda.amp.autocast(), torch.no_grad(): # pyright: ignore
+            all_results = model.test_step(batch) # pyright: ignore
 
-                # Split results back by image
-                start_idx = 0
-                for length in img_lengths:
-                    results_by_image.append(all_results[start_idx:start_idx + length])
-                    start_idx += length
+        if verbose:
+            print(f"Pose Detection Processing Time: {time.perf_counter() - start_time  :.3f} seconds")
 
-            if verbose:
-                print(f"Pose Detection Processing Time: {time.perf_counter() - start_time  :.3f} seconds")
+        # One sample per image
+        return [[result] for result in all_results]
 
-            return results_by_image
+    @staticmethod
+    def _run_inference(model: torch.nn.Module, pipeline: Compose, imgs: list[np.ndarray], verbose: bool) -> list[list[PoseDataSample]]:
+        data_list: list[dict] = [PoseDetection._prepare_sample(pipeline, model.dataset_meta, img) for img in imgs] # pyright: ignore
+        return PoseDetection._run_batch(model, data_list, verbose)
 
     @staticmethod
     def _extract_point_data_from_samples(data_samples: list[list[PoseDataSample]], model_width: int, model_height: int, confidence_threshold: float) -> list[PosePointData | None]:
         """Process pose data samples and return only the first detected pose for each image."""
+        model_size: np.ndarray = np.array([model_width, model_height], dtype=np.float32)
         first_poses: list[PosePointData | None] = []
 
         for data_samples_for_image in data_samples:
-            pose_found = False
+            pose: PosePointData | None = None
 
             for data_sample in data_samples_for_image:
                 pred_instances: InstanceData = data_sample.pred_instances
-                keypoints: np.ndarray = pred_instances.get('keypoints', np.full((0, 17, 2), np.nan, dtype=np.float32))
-                scores: np.ndarray = pred_instances.get('keypoint_scores', np.zeros((0, 17), dtype=np.float32))
+                keypoints: np.ndarray | None = pred_instances.get('keypoints', None)
+                scores: np.ndarray | None = pred_instances.get('keypoint_scores', None)
 
-                if keypoints.shape[0] == 0:
+                if keypoints is None or scores is None or keypoints.shape[0] == 0:
                     continue  # No pose detected
 
-                # Take only first person's pose in keypoints array
-                norm_keypoints: np.ndarray = keypoints[0].copy() / np.array([model_width, model_height])
-                person_scores: np.ndarray = scores[0].copy()
-
-                # Create pose and add to result
-                pose = PosePointData(norm_keypoints, person_scores, confidence_threshold)
-                first_poses.append(pose)
-                pose_found = True
+                # Take only first person's pose, raw points and scores are copied into one (17, 3) block
+                raw: np.ndarray = np.empty((keypoints.shape[1], 3), dtype=np.float32)
+                np.divide(keypoints[0], model_size, out=raw[:, :2])
+                raw[:, 2] = scores[0]
+                pose = PosePointData(raw[:, :2], raw[:, 2], confidence_threshold)
                 break  # Stop after finding first pose
 
             # If no pose found for this image, add None
-            if not pose_found:
-                first_poses.append(None)
+            first_poses.append(pose)
 
         return first_poses
-
-    @staticmethod
-    def resize_with_pad(image, target_width, target_height, padding_color=(0, 0, 0)) -> np.ndarray:
-        # Get the original dimensions
-        original_height, original_width = image.shape[:2]
-
-        # Calculate the aspect ratio
-        aspect_ratio: float = original_width / original_height
-
-        # Determine the new dimensions while maintaining the aspect ratio
-        if target_width / target_height > aspect_ratio:
-            new_height: int = target_height
-            new_width = int(target_height * aspect_ratio)
-        else:
-            new_width: int = target_width
-            new_height = int(target_width / aspect_ratio)
-
-        # Resize the image
-        resized_image: np.ndarray = cv2.resize(image, (new_width, new_height))
-
-        # Create a new image with the target dimensions and the padding color
-        padded_image: np.ndarray = np.full((target_height, target_width, 3), padding_color, dtype=np.uint8)
-
-        # Calculate the position to place the resized image
-        x_offset: int = (target_width - new_width) // 2
-        y_offset: int = (target_height - new_height) // 2
-
-        # Place the resized image on the padded image
-        padded_image[y_offset:y_offset+new_height, x_offset:x_offset+new_width] = resized_image
-
-        return padded_image
\ No newline at end of file
@@ -1,5 +1,6 @@
 import cv2
 import numpy as np
+from typing import Optional
 from modules.tracker.Tracklet import Tracklet, Rect
 
 from modules.utils.HotReloadMethods import HotReloadMethods
@@ -16,49 +17,56 @@ class PoseImageProcessor:
 
         hot_reloader = HotReloadMethods(self.__class__)
 
-    def process_pose_image(self, tracklet: Tracklet, image: np.ndarray) -> tuple[np.ndarray, Rect]:
+    def process_pose_image(self, tracklet: Tracklet, image: np.ndarray) -> Optional[tuple[np.ndarray, Rect]]:
         """
         Process and return the pose image and crop rectangle for a pose.
-        Returns tuple of (cropped_image, crop_rect).
+        Returns tuple of (cropped_image, crop_rect), or None when the crop is empty.
         """
-        h, w = image.shape[:2]
-        roi: Rect = self.get_crop_rect(w, h, tracklet.roi, self.aspect_ratio, self.crop_expansion)
-        cropped_image: np.ndarray = self.get_cropped_image(image, roi, self.output_width, self.output_height)
-        return cropped_image, roi
+        return self.process_pose_images([tracklet], [image])[0]
 
-    @staticmethod
-    def get_crop_rect(image_width: int, image_height: int, roi: Rect, aspect_ratio: float, expansion: float = 0.0) -> Rect:
-        """Calculate the crop rectangle for pose detection"""
+    def process_pose_images(self, tracklets: list[Tracklet], images: list[np.ndarray]) -> list[Optional[tuple[np.ndarray, Rect]]]:
+        """
+        Process the pose images for several tracklets at once, each tracklet with its own camera image.
+        The crop rectangles are computed in a single vectorized pass.
+        Tracklets whose crop is empty get None, so one bad roi does not fail the whole batch.
+        """
+        if not tracklets:
+            return []
+        image_sizes: np.ndarray = np.array([image.shape[1::-1] for image in images], dtype=np.float64)
+        rois: np.ndarray = np.array([[t.roi.x, t.roi.y, t.roi.width, t.roi.height] for t in tracklets], dtype=np.float64)
+        crop_rects: np.ndarray = self.get_crop_rects(image_sizes, rois, self.aspect_ratio, self.crop_expansion)
+
+        results: list[Optional[tuple[np.ndarray, Rect]]] = []
+        for image, (x, y, w, h) in zip(images, crop_rects.tolist()):
+            image_height, image_width = image.shape[:2]
+            if int(w * image_width) <= 0 or int(h * image_height) <= 0:
+                results.append(None)
+                continue
+            roi: Rect = Rect(x, y, w, h)
+            results.append((self.get_cropped_image(image, roi, self.output_width, self.output_height), roi))
+        return results
 
-        # Calculate the original ROI coordinates
-        img_x = int(roi.x * image_width)
-        img_y = int(roi.y * image_height)
-        img_w = int(roi.width * image_width)
-        img_h = int(roi.height * image_height)
+    @staticmethod
+    def get_crop_rects(image_sizes: np.ndarray, rois: np.ndarray, aspect_ratio: float, expansion: float = 0.0) -> np.ndarray:
+        """
+        Calculate the crop rectangles for pose detection for N rois.
+        image_sizes is (N, 2) as width, height, rois is (N, 4) as normalized x, y, width, height.
+        Returns (N, 4) normalized crop rectangles.
+        """
+        sizes: np.ndarray = np.tile(image_sizes, 2)
+        img_x, img_y, img_w, img_h = np.trunc(rois * sizes).T
 
         # Calculate dimensions that maintain aspect_ratio while covering the entire ROI
-        roi_aspect: float = img_w / img_h
+        wide: np.ndarray = img_w / img_h > aspect_ratio
+        crop_w: np.ndarray = np.trunc(img_w * (1 + expansion))
+        crop_h: np.ndarray = np.trunc(img_h * (1 + expansion))
+        crop_w, crop_h = np.where(wide, crop_w, np.trunc(crop_h * aspect_ratio)), np.where(wide, np.floor_divide(crop_w, aspect_ratio), crop_h)
 
-        if roi_aspect > aspect_ratio:
-            crop_w: int = int(img_w * (1 + expansion))
-            crop_h: int = int(crop_w // aspect_ratio)
-        else:
-            crop_h: int = int(img_h * (1 + expansion))
-            crop_w: int = int(crop_h * aspect_ratio)
-
-        # Calculate the new coordinates to center the square cutout around the original ROI
-        crop_center_x: int = img_x + img_w // 2
-        crop_center_y: int = img_y + img_h // 2
-        crop_x: int = crop_center_x - crop_w // 2
-        crop_y: int = crop_center_y - crop_h // 2
+        # Center the cutout around the original ROI
+        crop_x: np.ndarray = img_x + img_w // 2 - crop_w // 2
+        crop_y: np.ndarray = img_y + img_h // 2 - crop_h // 2
 
-        # convert back to normalized coordinates
-        norm_x: float = crop_x / image_width
-        norm_y: float = crop_y / image_height
-        norm_w: float = crop_w / image_width
-        norm_h: float = crop_h / image_height
-
-        return Rect(norm_x, norm_y, norm_w, norm_h)
+        return np.stack([crop_x, crop_y, crop_w, crop_h], axis=1) / sizes
 
     @staticmethod
     def get_cropped_image(image: np.ndarray, roi: Rect, output_width: int, output_height: int) -> np.ndarray:
@@ -72,25 +80,39 @@ class PoseImageProcessor:
         w: int = int(roi.width * image_width)
         h: int = int(roi.height * image_height)
 
-        # Extract the roi without padding
-        img_x: int = max(0, x)
-        img_y: int = max(0, y)
-        img_w: int = min(w + min(0, x), image_width - img_x)
-        img_h: int = min(h + min(0, y), image_height - img_y)
-
-        crop: np.ndarray = image[img_y:img_y + img_h, img_x:img_x + img_w]
+        scale_x: float = output_width / w
+        scale_y: float = output_height / h
+
+        crop: np.ndarray
+        if scale_x < 0.5 or scale_y < 0.5:
+            # strong downscales need area averaging to avoid aliasing, crop and pad first, then resize
+            img_x: int = max(0, x)
+            img_y: int = max(0, y)
+            img_w: int = max(0, min(x + w, image_width) - img_x)
+            img_h: int = max(0, min(y + h, image_height) - img_y)
+            if img_w == 0 or img_h == 0:
+                # the roi lies completely outside the image
+                crop = np.zeros((output_height, output_width) + image.shape[2:], dtype=image.dtype)
+            else:
+                crop = image[img_y:img_y + img_h, img_x:img_x + img_w]
+
+                # Apply padding if the roi is outside the image bounds
+                left_padding: int = img_x - x
+                top_padding: int = img_y - y
+                right_padding: int = w - img_w - left_padding
+                bottom_padding: int = h - img_h - top_padding
+                if left_padding + right_padding + top_padding + bottom_padding > 0:
+                    crop = cv2.copyMakeBorder(crop, top_padding, bottom_padding, left_padding, right_padding, cv2.BORDER_CONSTANT, value=0)
+
+                crop = cv2.resize(crop, (output_width, output_height), interpolation=cv2.INTER_AREA)
+        else:
+            # Crop, pad and resize in a single pass, areas outside the image are filled with black
+            # the (s - 1) / 2 offset maps pixel centers onto pixel centers, like resize does
+            M: np.ndarray = np.array([[scale_x, 0.0, -scale_x * x + (scale_x - 1.0) / 2.0],
+                                      [0.0, scale_y, -scale_y * y + (scale_y - 1.0) / 2.0]], dtype=np.float32)
+            crop = cv2.warpAffine(image, M, (output_width, output_height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
 
         if image_channels == 1:
             crop = cv2.cvtColor(crop, cv2.COLOR_GRAY2RGB)
 
-        # Apply padding if the roi is outside the image bounds
-        left_padding: int = -min(0, x)
-        top_padding: int = -min(0, y)
-        right_padding: int = max(0, x + w - image_width)
-        bottom_padding: int = max(0, y + h - image_height)
-
-        if left_padding + right_padding + top_padding + bottom_padding > 0:
-            crop = cv2.copyMakeBorder(crop, top_padding, bottom_padding, left_padding, right_padding, cv2.BORDER_CONSTANT, value=[0, 0, 0])
-
-        # Resize the cutout to the desired size
-        return cv2.resize(crop, (output_width, output_height), interpolation=cv2.INTER_AREA)
\ No newline at end of file
+        return crop
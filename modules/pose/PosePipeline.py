@@ -10,7 +10,7 @@ import numpy as np
 from modules.cam.depthcam.Definitions import FrameType
 from modules.tracker.Tracklet import Tracklet, Rect
 from modules.pose.Pose import Pose, PoseCallback
-from modules.pose.PoseDetection import PoseDetection, POSE_MODEL_TYPE_NAMES
+from modules.pose.PoseDetection import PoseDetection, POSE_MODEL_TYPE_NAMES, POSE_MODEL_WIDTH, POSE_MODEL_HEIGHT
 from modules.pose.PoseImageProcessor import PoseImageProcessor
 from modules.Settings import Settings
 
@@ -23,12 +23,13 @@ class PosePipeline(Thread):
         self._stop_event = Event()
         self.tracklet_input_queue: Queue[Tracklet] = Queue()
 
-        self.input_mutex: Lock = Lock()
+        # single-key dict stores and lookups are atomic, each cam only replaces its own frame
         self.input_frames: dict[int, np.ndarray] = {}
 
         self.pose_active: bool = settings.pose_active
-        self.pose_detector_frame_width: int = 192
-        self.pose_detector_frame_height: int = 256
+        # crops are produced at the exact model input size, so no further resizing is needed
+        self.pose_detector_frame_width: int = POSE_MODEL_WIDTH
+        self.pose_detector_frame_height: int = POSE_MODEL_HEIGHT
         self.pose_crop_expansion: float = settings.pose_crop_expansion
         self.max_detectors: int = settings.num_players
         self.pose_detector: PoseDetection | None = None
@@ -48,6 +49,7 @@ class PosePipeline(Thread):
         # Callbacks
         self.callback_lock = Lock()
         self.pose_output_callbacks: set[PoseCallback] = set()
+        self.pose_output_callbacks_snapshot: tuple[PoseCallback, ...] = ()  # rebuilt on change, iterated without lock
 
         hot_reloader = HotReloadMethods(self.__class__)
 
@@ -68,6 +70,7 @@ class PosePipeline(Thread):
         self.join()
         with self.callback_lock:
             self.pose_output_callbacks.clear()
+            self.pose_output_callbacks_snapshot = ()
 
         if self.pose_detector is not None:
             self.pose_detector.stop()
@@ -79,31 +82,49 @@ class PosePipeline(Thread):
         """
         while not self._stop_event.is_set():
             try:
-                tracklet: Optional[Tracklet] = self.tracklet_input_queue.get(block=True, timeout=0.01)
-                if tracklet is not None:
-                    self._process(tracklet)
+                tracklet: Optional[Tracklet] = self.tracklet_input_queue.get(block=True, timeout=0.1)
             except Empty:
                 continue
 
-    def _process(self, tracklet: Tracklet) -> None:
+            # take everything that is pending, so the crops can be computed together
+            tracklets: list[Tracklet] = [tracklet] if tracklet is not None else []
+            while True:
+                try:
+                    tracklet = self.tracklet_input_queue.get_nowait()
+                except Empty:
+                    break
+                if tracklet is not None:
+                    tracklets.append(tracklet)
 
-        pose_image: Optional[np.ndarray] = None
-        pose_crop_rect: Optional[Rect] = None
-        cam_image: Optional[np.ndarray] = self._get_image(tracklet.cam_id)
+            if tracklets:
+                self._process(tracklets)
 
-        if cam_image is not None and tracklet.is_active:
-            pose_image, pose_crop_rect = self.image_processor.process_pose_image(tracklet, cam_image)
+    def _process(self, tracklets: list[Tracklet]) -> None:
 
-        pose = Pose(
-            tracklet=tracklet,
-            crop_rect = pose_crop_rect,
-            crop_image = pose_image
+        cam_images: list[Optional[np.ndarray]] = [self._get_image(tracklet.cam_id) for tracklet in tracklets]
+        crop_indices: list[int] = [i for i, tracklet in enumerate(tracklets) if cam_images[i] is not None and tracklet.is_active]
+        crops: list[Optional[tuple[np.ndarray, Rect]]] = self.image_processor.process_pose_images(
+            [tracklets[i] for i in crop_indices],
+            [cam_images[i] for i in crop_indices] # pyright: ignore
         )
-        if self.pose_detector is not None:
-            if pose.crop_image is not None and pose.crop_rect is not None:
-                self.pose_detector.add_pose(pose)
-            return
-        self._notify_pose_callback(pose)
+        crop_per_tracklet: dict[int, tuple[np.ndarray, Rect]] = {i: crop for i, crop in zip(crop_indices, crops) if crop is not None}
+
+        for i, tracklet in enumerate(tracklets):
+            pose_image: Optional[np.ndarray] = None
+            pose_crop_rect: Optional[Rect] = None
+            if i in crop_per_tracklet:
+                pose_image, pose_crop_rect = crop_per_tracklet[i]
+
+            pose = Pose(
+                tracklet=tracklet,
+                crop_rect = pose_crop_rect,
+                crop_image = pose_image
+            )
+            if self.pose_detector is not None:
+                if pose.crop_image is not None and pose.crop_rect is not None:
+                    self.pose_detector.add_pose(pose)
+                continue
+            self._notify_pose_callback(pose)
 
      # INPUTS
     def add_tracklet(self, tracklet: Tracklet) -> None:
@@ -112,14 +133,10 @@ class PosePipeline(Thread):
     def set_image(self, id: int, frame_type: FrameType, image: np.ndarray) -> None :
         if frame_type != FrameType.VIDEO:
             return
-        with self.input_mutex:
-            self.input_frames[id] = image
+        self.input_frames[id] = image
 
     def _get_image(self, id: int) -> Optional[np.ndarray]:
-        with self.input_mutex:
-            if not self.input_frames.get(id) is None:
-                return self.input_frames[id]
-            return None
+        return self.input_frames.get(id)
 
     def notify_update_from_image(self, cam_id: int, frame_type, image) -> None:
         if cam_id == 0 and self.pose_detector is not None:
@@ -129,8 +146,8 @@ class PosePipeline(Thread):
     def add_pose_callback(self, callback: PoseCallback) -> None:
         with self.callback_lock:
             self.pose_output_callbacks.add(callback)
+            self.pose_output_callbacks_snapshot = tuple(self.pose_output_callbacks)
 
     def _notify_pose_callback(self, pose: Pose) -> None:
-        with self.callback_lock:
-            for callback in self.pose_output_callbacks:
-                callback(pose)
\ No newline at end of file
+        for callback in self.pose_output_callbacks_snapshot:
+            callback(pose)
\ No newline at end of file
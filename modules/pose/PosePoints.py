@@ -16,12 +16,11 @@ class PosePointData():
         s_t: float = max(0.0, min(0.99, self.score_threshold))
         object.__setattr__(self, 'score_threshold', s_t)
 
-        # Filter points based on threshold
-        filtered = self.raw_scores >= self.score_threshold
-        object.__setattr__(self, 'points', np.where(filtered[:, np.newaxis], self.raw_points, np.nan))
-
-        # Normalize scores based on threshold
-        normalized: np.ndarray = np.zeros_like(self.raw_scores)
-        above_threshold = self.raw_scores >= self.score_threshold
-        normalized[above_threshold] = (self.raw_scores[above_threshold] - self.score_threshold) / (1.0 - self.score_threshold)
-        object.__setattr__(self, 'scores', normalized)
+        # Filtered points and normalized scores share one (17, 3) block, points and scores are views into it
+        above_threshold: np.ndarray = self.raw_scores >= s_t
+        block: np.ndarray = np.zeros((self.raw_points.shape[0], 3), dtype=np.float32)
+        block[:, :2] = self.raw_points
+        block[~above_threshold, :2] = np.nan
+        block[above_threshold, 2] = (self.raw_scores[above_threshold] - s_t) / (1.0 - s_t)
+        object.__setattr__(self, 'points', block[:, :2])
+        object.__setattr__(self, 'scores', block[:, 2])
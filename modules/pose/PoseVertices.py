@@ -1,5 +1,6 @@
 import numpy as np
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional
 
 from modules.pose.PosePoints import PosePointData
@@ -28,26 +29,35 @@ POSE_VERTEX_LIST: list[list[PoseJoint]] = [
 POSE_VERTEX_ARRAY: np.ndarray = np.array([kp.value for pose in POSE_VERTEX_LIST for kp in pose], dtype=np.int32)
 POSE_VERTEX_INDICES: np.ndarray = np.arange(len(POSE_VERTEX_ARRAY), dtype=np.int32)
 
+# per vertex lookups, so vertices and colors can be gathered in single numpy operations
+POSE_VERTEX_COLORS: np.ndarray = np.array([POSE_JOINT_COLORS[PoseJoint(j)] for j in POSE_VERTEX_ARRAY], dtype=np.float32)
+POSE_VERTEX_ANGLE_IDXS: np.ndarray = np.array([POSE_ANGLE_JOINT_IDXS.get(PoseJoint(j), -1) for j in POSE_VERTEX_ARRAY], dtype=np.int32)
+POSE_VERTEX_HAS_ANGLE: np.ndarray = POSE_VERTEX_ANGLE_IDXS >= 0
+POSE_VERTEX_IS_LEFT: np.ndarray = POSE_VERTEX_ARRAY % 2 == 1
+
 # CLASSES
 @dataclass(frozen=True)
 class PoseVertexData:
     vertices: np.ndarray
     colors: np.ndarray
 
+    @cached_property
+    def colors_rgba8(self) -> np.ndarray:
+        """colors as normalized 8 bit rgba, made once per pose for the mesh upload"""
+        return np.rint(self.colors * 255.0).astype(np.uint8)
+
 class PoseVertices:
     @staticmethod
     def compute_vertices(point_data: Optional[PosePointData]) -> Optional[PoseVertexData]:
         if point_data is None:
             return None
 
-        vertices: np.ndarray = np.zeros((len(POSE_VERTEX_ARRAY), 2), dtype=np.float32)
-        colors: np.ndarray = np.zeros((len(POSE_VERTEX_ARRAY), 4), dtype=np.float32)
-
-        for i, (p1, p2) in enumerate(POSE_VERTEX_LIST):
-            for j, joint in enumerate((p1, p2)):
-                idx: int = i * 2 + j
-                vertices[idx] = point_data.points[joint]
-                colors[idx] = [*POSE_JOINT_COLORS[joint], (point_data.scores[joint] + POSE_COLOR_ALPHA_BASE) / (1.0 + POSE_COLOR_ALPHA_BASE)]
+        # vertices are made with a zero z, the layout the mesh buffers use, so the mesh does not have to pad them every frame
+        vertices: np.ndarray = np.zeros((len(POSE_VERTEX_ARRAY), 3), dtype=np.float32)
+        vertices[:, :2] = point_data.points[POSE_VERTEX_ARRAY]
+        colors: np.ndarray = np.empty((len(POSE_VERTEX_ARRAY), 4), dtype=np.float32)
+        colors[:, :3] = POSE_VERTEX_COLORS
+        colors[:, 3] = (point_data.scores[POSE_VERTEX_ARRAY] + POSE_COLOR_ALPHA_BASE) / (1.0 + POSE_COLOR_ALPHA_BASE)
 
         vertex_data: PoseVertexData = PoseVertexData(vertices, colors)
         return vertex_data
@@ -65,17 +75,15 @@ class PoseVertices:
         if angle_data is None:
             return vertex_data
 
-        colors: np.ndarray = vertex_data.colors.copy()
+        colors: np.ndarray = vertex_data.colors  # freshly made by compute_vertices, safe to recolor in place
 
-        for i, (p1, p2) in enumerate(POSE_VERTEX_LIST):
-            for joint_pos, joint in enumerate((p1, p2)):
-                idx: int | None = POSE_ANGLE_JOINT_IDXS.get(joint)
-                if idx is not None:
-                    angle: float = angle_data.angles[idx]
-                    if not np.isnan(angle):
-                        if joint.value % 2 == 1:  # Left side
-                            colors[i*2 + joint_pos][0:3] = POSE_COLOR_LEFT_POSITIVE if angle >= 0 else POSE_COLOR_LEFT_NEGATIVE
-                        else:  # Right side
-                            colors[i*2 + joint_pos][0:3] = POSE_COLOR_RIGHT_POSITIVE if angle >= 0 else POSE_COLOR_RIGHT_NEGATIVE
+        # vertices of joints with a valid angle get the positive or negative color of their side
+        angles: np.ndarray = angle_data.angles[np.maximum(POSE_VERTEX_ANGLE_IDXS, 0)]
+        valid: np.ndarray = POSE_VERTEX_HAS_ANGLE & ~np.isnan(angles)
+        positive: np.ndarray = angles >= 0
+        colors[valid &  POSE_VERTEX_IS_LEFT &  positive, 0:3] = POSE_COLOR_LEFT_POSITIVE
+        colors[valid &  POSE_VERTEX_IS_LEFT & ~positive, 0:3] = POSE_COLOR_LEFT_NEGATIVE
+        colors[valid & ~POSE_VERTEX_IS_LEFT &  positive, 0:3] = POSE_COLOR_RIGHT_POSITIVE
+        colors[valid & ~POSE_VERTEX_IS_LEFT & ~positive, 0:3] = POSE_COLOR_RIGHT_NEGATIVE
 
-        return PoseVertexData(vertex_data.vertices, colors)
\ No newline at end of file
+        return PoseVertexData(vertex_data.vertices, colors)
@@ -1,7 +1,6 @@
 import numpy as np
 from itertools import combinations
 from typing import Optional, Tuple, Dict, List
-from threading import Lock
 from dataclasses import dataclass, field
 from typing import Optional, TypeVar, Generic
 
@@ -24,32 +23,33 @@ class DataItem(Generic[T]):
 CorrelationStreamDict = Dict[int, Tuple[Tuple[int, int], np.ndarray]]
 
 class DataManager:
+    # Producers publish a new DataItem per value with a single dict store and consumers read it with a
+    # single lookup, both atomic, so no lock is needed. Scans over all items work on a snapshot of the values.
     def __init__(self) -> None:
-        self.mutex: Lock = Lock()
-
         # Data storage
         self.light_image: Dict[int, DataItem[WSOutput]] = {}
         self.cam_image: Dict[int, DataItem[np.ndarray]] = {}
         self.depth_tracklets: Dict[int, DataItem[List[DepthTracklet]]] = {}
         self.tracklets: Dict[int, DataItem[Tracklet]] = {}
         self.poses: Dict[int, DataItem[Pose]] = {}
+        # per camera views of tracklets and poses, keyed by cam_id then by id, kept in sync by the setters
+        self.tracklets_by_cam: Dict[int, Dict[int, Tracklet]] = {}
+        self.poses_by_cam: Dict[int, Dict[int, Pose]] = {}
         self.pose_streams: Dict[int, DataItem[PoseStreamData]] = {}
         self.r_streams: Dict[int, DataItem[PairCorrelationStreamData]] = {}
 
     def _set_data_dict(self, data_dict: Dict[int, DataItem[T]], data_key: int, value: T) -> None:
-        with self.mutex:
-            data_dict[data_key] = DataItem(value)
+        data_dict[data_key] = DataItem(value)
 
     def _get_data_dict(self, data_dict: Dict[int, DataItem[T]], data_key: int, only_new_data: bool, consumer_key: str) -> Optional[T]:
-        with self.mutex:
-            item: Optional[DataItem[T]] = data_dict.get(data_key)
-            if not item:
-                return None
-            if only_new_data and item.accessed.get(consumer_key, False):
-                return None
-            if only_new_data:
-                item.accessed[consumer_key] = True
-            return item.value
+        item: Optional[DataItem[T]] = data_dict.get(data_key)
+        if not item:
+            return None
+        if only_new_data and item.accessed.get(consumer_key, False):
+            return None
+        if only_new_data:
+            item.accessed[consumer_key] = True
+        return item.value
 
     # Audio-visual data management
     def set_light_image(self, value: WSOutput) -> None:
@@ -75,34 +75,40 @@ class DataManager:
 
     # Tracklet management
     def set_tracklet(self, value: Tracklet) -> None:
+        old: Optional[DataItem[Tracklet]] = self.tracklets.get(value.id)
+        if old is not None and old.value is not None and old.value.cam_id != value.cam_id:
+            self.tracklets_by_cam.get(old.value.cam_id, {}).pop(value.id, None)
+        self.tracklets_by_cam.setdefault(value.cam_id, {})[value.id] = value
         self._set_data_dict(self.tracklets, value.id, value)
 
     def get_tracklet(self, id: int, only_new_data: bool, consumer_key: str) -> Optional[Tracklet]:
         return self._get_data_dict(self.tracklets, id, only_new_data, consumer_key)
 
     def get_tracklets(self) -> dict[int, Tracklet]:
-        with self.mutex:
-            return {k: v.value for k, v in self.tracklets.items() if v.value is not None}
+        return {k: v.value for k, v in list(self.tracklets.items()) if v.value is not None}
 
-    def get_tracklets_for_cam(self, cam_id: int) -> list[Tracklet]:
-        with self.mutex:
-            return [v.value for v in self.tracklets.values() if v.value is not None and v.value.cam_id == cam_id]
+    def get_tracklets_for_cam(self, cam_id: int) -> tuple[Tracklet, ...]:
+        bucket: Optional[Dict[int, Tracklet]] = self.tracklets_by_cam.get(cam_id)
+        return tuple(bucket.values()) if bucket else ()
 
 
     def get_active_tracklets_for_cam(self, cam_id: int) -> list[Tracklet]:
-        with self.mutex:
-            return [v.value for v in self.tracklets.values() if v.value is not None and v.value.cam_id == cam_id and v.value.is_active]
+        return [t for t in self.get_tracklets_for_cam(cam_id) if t.is_active]
 
     # Pose management
     def set_pose(self, value: Pose) -> None:
+        old: Optional[DataItem[Pose]] = self.poses.get(value.tracklet.id)
+        if old is not None and old.value is not None and old.value.tracklet.cam_id != value.tracklet.cam_id:
+            self.poses_by_cam.get(old.value.tracklet.cam_id, {}).pop(value.tracklet.id, None)
+        self.poses_by_cam.setdefault(value.tracklet.cam_id, {})[value.tracklet.id] = value
         self._set_data_dict(self.poses, value.tracklet.id, value)
 
     def get_pose(self, id: int, only_new_data: bool, consumer_key: str) -> Optional[Pose]:
         return self._get_data_dict(self.poses, id, only_new_data, consumer_key)
 
-    def get_poses_for_cam(self, cam_id: int) -> List[Pose]:
-        with self.mutex:
-            return [v.value for v in self.poses.values() if v.value is not None and v.value.tracklet.cam_id == cam_id]
+    def get_poses_for_cam(self, cam_id: int) -> Tuple[Pose, ...]:
+        bucket: Optional[Dict[int, Pose]] = self.poses_by_cam.get(cam_id)
+        return tuple(bucket.values()) if bucket else ()
 
     # Pose window/stream management
     def set_pose_stream(self, value: PoseStreamData) -> None:
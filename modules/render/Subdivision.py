@@ -1,6 +1,7 @@
 from enum import IntEnum
 import math
 from dataclasses import dataclass, field, replace
+from functools import lru_cache
 
 from modules.utils.PointsAndRects import Rect, Point2f
 
@@ -48,6 +49,16 @@ class Subdivision:
         return int(rect.width), int(rect.height)
 
 def make_subdivision(subdivision_rows: list[SubdivisionRow], dst_width: int, dst_height: int, align_center: bool) -> Subdivision:
+    # rows are reduced to hashable tuples so layouts of window sizes seen before come from the cache
+    row_keys: tuple[tuple[str, int, int, float, float, float], ...] = tuple(
+        (row.name, row.columns, row.rows, row.padding.x, row.padding.y, row.src_aspect_ratio) for row in subdivision_rows)
+    return _make_subdivision(row_keys, dst_width, dst_height, align_center)
+
+@lru_cache(maxsize=16)
+def _make_subdivision(row_keys: tuple[tuple[str, int, int, float, float, float], ...], dst_width: int, dst_height: int, align_center: bool) -> Subdivision:
+    subdivision_rows: list[SubdivisionRow] = [
+        SubdivisionRow(name=name, columns=columns, rows=rows, padding=Point2f(pad_x, pad_y), src_aspect_ratio=src_aspect_ratio)
+        for name, columns, rows, pad_x, pad_y, src_aspect_ratio in row_keys]
 
     dst_aspect_ratio: float = dst_width / dst_height
     tot_aspect_ratio: float = 1.0 / sum(1.0 / cell.tot_aspect_ratio for cell in subdivision_rows)
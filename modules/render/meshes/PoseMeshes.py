@@ -41,5 +41,6 @@ class PoseMeshes(BaseRender):
                 vertex_data: PoseVertexData | None = pose.vertex_data
                 if vertex_data is not None:
                     pose_mesh.set_vertices(vertex_data.vertices)
-                    pose_mesh.set_colors(vertex_data.colors)
+                    # 8 bit colors, a quarter of the float upload
+                    pose_mesh.set_colors(vertex_data.colors_rgba8)
                     pose_mesh.update()
\ No newline at end of file
@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from OpenGL.GL import * # type: ignore
 
 # Local application imports
+from modules.gl.RenderBase import set_view
 from modules.utils.PointsAndRects import Rect
 
 class BaseRender(ABC):
@@ -35,8 +36,4 @@ class BaseRender(ABC):
 
     @staticmethod
     def setView(width, height) -> None:
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, width, height, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glViewport(0, 0, width, height)
+        set_view(width, height)
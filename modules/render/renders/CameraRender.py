@@ -8,6 +8,7 @@ from OpenGL.GL import * # type: ignore
 from modules.gl.Fbo import Fbo
 from modules.gl.Image import Image
 from modules.gl.Mesh import Mesh
+from modules.gl.RectangleBatch import RectangleBatch
 from modules.gl.Text import draw_box_string, text_init
 
 from modules.cam.depthcam.Definitions import Tracklet as DepthTracklet
@@ -20,6 +21,14 @@ from modules.render.meshes.PoseMeshes import PoseMeshes
 
 from modules.utils.HotReloadMethods import HotReloadMethods
 
+POSE_BACKDROP_COLOR: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.1)
+
+# depth tracklet box colors indexed by TrackingStatus value, NaN alpha means the alpha follows the tracklet age
+DEPTH_TRACKLET_RGB: np.ndarray = np.ones((len(DepthTracklet.TrackingStatus.__members__), 3), dtype=np.float32)
+DEPTH_TRACKLET_RGB[int(DepthTracklet.TrackingStatus.TRACKED)] = (0.0, 1.0, 0.0)
+DEPTH_TRACKLET_RGB[int(DepthTracklet.TrackingStatus.LOST)] = (1.0, 0.0, 0.0)
+DEPTH_TRACKLET_FIXED_ALPHA: np.ndarray = np.full(len(DepthTracklet.TrackingStatus.__members__), np.nan, dtype=np.float32)
+DEPTH_TRACKLET_FIXED_ALPHA[int(DepthTracklet.TrackingStatus.NEW)] = 1.0
 
 class CameraRender(BaseRender):
     def __init__(self, data: DataManager, pose_meshes: PoseMeshes, cam_id: int) -> None:
@@ -27,6 +36,8 @@ class CameraRender(BaseRender):
         self.pose_meshes: PoseMeshes = pose_meshes
         self.fbo: Fbo = Fbo()
         self.image: Image = Image()
+        self.depth_tracklet_rects: RectangleBatch = RectangleBatch()
+        self.pose_backdrop_rects: RectangleBatch = RectangleBatch()
         self.cam_id: int = cam_id
         text_init()
 
@@ -38,6 +49,8 @@ class CameraRender(BaseRender):
     def deallocate(self) -> None:
         self.fbo.deallocate()
         self.image.deallocate()
+        self.depth_tracklet_rects.deallocate()
+        self.pose_backdrop_rects.deallocate()
 
     def draw(self, rect: Rect) -> None:
         self.fbo.draw(rect.x, rect.y, rect.width, rect.height)
@@ -49,18 +62,20 @@ class CameraRender(BaseRender):
             self.image.update()
         fbo: Fbo = self.fbo
         depth_tracklets: list[DepthTracklet] | None = self.data.get_depth_tracklets(self.cam_id, False, self.key())
-        poses: list[Pose] = self.data.get_poses_for_cam(self.cam_id)
+        poses: tuple[Pose, ...] = self.data.get_poses_for_cam(self.cam_id)
         meshes: dict[int, Mesh] = self.pose_meshes.meshes
 
         BaseRender.setView(fbo.width, fbo.height)
         fbo.begin()
         glClearColor(0.0, 0.0, 0.0, 1.0)
         self.image.draw(0, 0, fbo.width, fbo.height)
-        CameraRender.draw_camera_overlay(depth_tracklets, poses, meshes, 0, 0, fbo.width, fbo.height)
+        CameraRender.draw_camera_overlay(depth_tracklets, poses, meshes, self.pose_backdrop_rects, self.depth_tracklet_rects, 0, 0, fbo.width, fbo.height)
         fbo.end()
 
     @staticmethod
-    def draw_camera_overlay(depth_tracklets: list[DepthTracklet], poses: list[Pose], pose_meshes: dict[int, Mesh], x: float, y: float, width: float, height: float) -> None:
+    def draw_camera_overlay(depth_tracklets: list[DepthTracklet], poses: tuple[Pose, ...], pose_meshes: dict[int, Mesh], backdrop_rects: RectangleBatch, tracklet_rects: RectangleBatch, x: float, y: float, width: float, height: float) -> None:
+        rects: list[tuple[float, float, float, float]] = []
+        meshes: list[Mesh] = []
         for pose in poses:
             tracklet: Tracklet | None = pose.tracklet
             if tracklet is None or tracklet.is_removed or tracklet.is_lost:
@@ -69,71 +84,61 @@ class CameraRender(BaseRender):
             mesh: Mesh = pose_meshes[pose.tracklet.id]
             if roi is None or not mesh.isInitialized():
                 continue
-            roi_x, roi_y, roi_w, roi_h = roi.x, roi.y, roi.width, roi.height
-            roi_x: float = x + roi_x * width
-            roi_y: float = y + roi_y * height
-            roi_w: float = roi_w * width
-            roi_h: float = roi_h * height
-            CameraRender.draw_tracklet(tracklet, mesh, roi_x, roi_y, roi_w, roi_h)
+            rects.append((x + roi.x * width, y + roi.y * height, roi.width * width, roi.height * height))
+            meshes.append(mesh)
+
+        # all backdrops in one draw call, then the pose meshes on top
+        if rects:
+            colors: np.ndarray = np.tile(np.array(POSE_BACKDROP_COLOR, dtype=np.float32), (len(rects), 1))
+            backdrop_rects.draw(np.array(rects, dtype=np.float32), colors)
+            glColor4f(1.0, 1.0, 1.0, 1.0)  # Reset color
+        for mesh, (roi_x, roi_y, roi_w, roi_h) in zip(meshes, rects):
+            mesh.draw(roi_x, roi_y, roi_w, roi_h)
 
-        for depth_tracklet in depth_tracklets:
-            CameraRender.draw_depth_tracklet(depth_tracklet, 0, 0, width, height)
+        CameraRender.draw_depth_tracklets(depth_tracklets, tracklet_rects, 0, 0, width, height)
 
     @staticmethod
-    def draw_depth_tracklet(tracklet: DepthTracklet, x: float, y: float, width: float, height: float) -> None:
-        if tracklet.status == DepthTracklet.TrackingStatus.REMOVED:
+    def draw_depth_tracklets(depth_tracklets: list[DepthTracklet] | None, tracklet_rects: RectangleBatch, x: float, y: float, width: float, height: float) -> None:
+        if not depth_tracklets:
             return
 
-        t_x: float = x + tracklet.roi.x * width
-        t_y: float = y + tracklet.roi.y * height
-        t_w: float = tracklet.roi.width * width
-        t_h: float = tracklet.roi.height* height
-
-        r: float = 1.0
-        g: float = 1.0
-        b: float = 1.0
-        a: float = min(tracklet.age / 100.0, 0.33)
-        if tracklet.status == DepthTracklet.TrackingStatus.NEW:
-            r, g, b, a = (1.0, 1.0, 1.0, 1.0)
-        if tracklet.status == DepthTracklet.TrackingStatus.TRACKED:
-            r, g, b, a = (0.0, 1.0, 0.0, a)
-        if tracklet.status == DepthTracklet.TrackingStatus.LOST:
-            r, g, b, a = (1.0, 0.0, 0.0, a)
-        if tracklet.status == DepthTracklet.TrackingStatus.REMOVED:
-            r, g, b, a = (1.0, 0.0, 0.0, 1.0)
-
-        glColor4f(r, g, b, a)   # Set color
-        glBegin(GL_QUADS)       # Start drawing a quad
-        glVertex2f(t_x, t_y)        # Bottom left
-        glVertex2f(t_x, t_y + t_h)    # Bottom right
-        glVertex2f(t_x + t_w, t_y + t_h)# Top right
-        glVertex2f(t_x + t_w, t_y)    # Top left
-        glEnd()                 # End drawing
-        glColor4f(1.0, 1.0, 1.0, 1.0)  # Reset color
-
-        string: str
-        t_x += t_w -6
-        if t_x + 66 > width:
-            t_x: float = width - 66
-        t_y += 22
-        string = f'ID: {tracklet.id}'
-        draw_box_string(t_x, t_y, string)
-        t_y += 22
-        string = f'Age: {tracklet.age}'
-        draw_box_string(t_x, t_y, string)
-
-    @staticmethod
-    def draw_tracklet(tracklet: Tracklet, pose_mesh: Mesh, x: float, y: float, width: float, height: float) -> None:
-        glColor4f(0.0, 0.0, 0.0, 0.1)
-        glBegin(GL_QUADS)
-        glVertex2f(x, y)        # Bottom left
-        glVertex2f(x, y + height)    # Bottom right
-        glVertex2f(x + width, y + height)# Top right
-        glVertex2f(x + width, y)    # Top left
-        glEnd()                 # End drawing
+        # read every attribute of the depthai objects once, roi returns a new object on each access
+        removed: int = int(DepthTracklet.TrackingStatus.REMOVED)
+        fields: list[tuple[float, float, float, float, int, int, int]] = []
+        for t in depth_tracklets:
+            status: int = int(t.status)
+            if status == removed:
+                continue
+            roi = t.roi
+            fields.append((roi.x, roi.y, roi.width, roi.height, t.age, status, t.id))
+        if not fields:
+            return
+        values: np.ndarray = np.array(fields, dtype=np.float32)
+        ages: np.ndarray = values[:, 4]
+        statuses: np.ndarray = values[:, 5].astype(np.intp)
+
+        # all boxes in one draw call, labels on top
+        rects: np.ndarray = values[:, :4] * np.array([width, height, width, height], dtype=np.float32)
+        rects[:, 0] += x
+        rects[:, 1] += y
+        colors: np.ndarray = np.empty((len(fields), 4), dtype=np.float32)
+        colors[:, :3] = DEPTH_TRACKLET_RGB[statuses]
+        fixed_alpha: np.ndarray = DEPTH_TRACKLET_FIXED_ALPHA[statuses]
+        colors[:, 3] = np.where(np.isnan(fixed_alpha), np.minimum(ages / 100.0, 0.33), fixed_alpha)
+        tracklet_rects.draw(rects, colors)
         glColor4f(1.0, 1.0, 1.0, 1.0)  # Reset color
 
-        if pose_mesh.isInitialized():
-            pose_mesh.draw(x, y, width, height)
+        for (t_x, t_y, t_w, _), field in zip(rects.tolist(), fields):
+            age, tracklet_id = field[4], field[6]
+            string: str
+            t_x += t_w -6
+            if t_x + 66 > width:
+                t_x = width - 66
+            t_y += 22
+            string = f'ID: {tracklet_id}'
+            draw_box_string(t_x, t_y, string)
+            t_y += 22
+            string = f'Age: {age}'
+            draw_box_string(t_x, t_y, string)
 
 
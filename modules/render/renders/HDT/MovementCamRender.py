@@ -63,7 +63,7 @@ class MovementCamRender(BaseRender):
 
 
 
-        tracklets: list[Tracklet] = self.data.get_tracklets_for_cam(self.cam_id)
+        tracklets: tuple[Tracklet, ...] = self.data.get_tracklets_for_cam(self.cam_id)
         if not tracklets:
             self.clear_fbo()
             return
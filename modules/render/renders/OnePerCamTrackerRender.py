@@ -56,7 +56,7 @@ class OnePerCamTrackerRender(BaseRender):
         if not self.shader.allocated:
             self.shader.allocate()
 
-        tracklets: list[Tracklet] = self.data.get_tracklets_for_cam(self.cam_id)
+        tracklets: tuple[Tracklet, ...] = self.data.get_tracklets_for_cam(self.cam_id)
         if not tracklets:
             self.clear_fbo()
             return
@@ -110,8 +110,13 @@ class Tracklet:
             warnings.warn("Missing 'roi' in DepthCamTracklet, setting to None.")
             return None
 
+        # one clock read for all timestamps instead of one per default_factory
+        now: Timestamp = Timestamp.now()
         return cls(
             cam_id=cam_id,
+            time_stamp=now,
+            created_at=now,
+            last_active=now,
             status=status,
             roi=roi,
             _external_tracklet=dct,
@@ -136,8 +141,12 @@ TrackletIdColorDict: dict[int, str] = {
     9: '#6495ed',   # cornflower
 }
 
+# parsed once at import, TrackletIdColor is called per tracklet per frame
+TrackletIdRgbDict: dict[int, tuple[float, float, float]] = {
+    tracklet_id: (int(hex_color[1:3], 16) / 255.0, int(hex_color[3:5], 16) / 255.0, int(hex_color[5:7], 16) / 255.0)
+    for tracklet_id, hex_color in TrackletIdColorDict.items()
+}
+
 def TrackletIdColor(id: int, aplha: float = 0.5) -> list[float]:
-    hex_color: str = TrackletIdColorDict.get(id, '#000000')
-    rgb: list[float] =  [int(hex_color[i:i+2], 16) / 255.0 for i in (1, 3, 5)]
-    rgb.append(aplha)
-    return rgb
\ No newline at end of file
+    # returns a new list, callers are free to modify it
+    return [*TrackletIdRgbDict.get(id, (0.0, 0.0, 0.0)), aplha]
\ No newline at end of file
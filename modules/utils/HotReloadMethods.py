@@ -2,20 +2,25 @@
 import hashlib
 import inspect
 import os
+import struct
 import sys
-import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock, Timer
 from dataclasses import dataclass
 from enum import Enum, auto
+from importlib import invalidate_caches
 from importlib.machinery import ModuleSpec
-from importlib.util import module_from_spec, spec_from_file_location
+from importlib.util import spec_from_file_location
 from types import CodeType, ModuleType
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Type
+from weakref import WeakKeyDictionary
 
 # Third-party imports
-from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.events import FileClosedEvent, FileCreatedEvent, FileModifiedEvent, FileMovedEvent, FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
-from watchdog.observers.api import BaseObserver
+from watchdog.observers.polling import PollingObserver
+from watchdog.observers.api import BaseObserver, ObservedWatch
 
 class MethodType(Enum):
     STATIC = auto()
@@ -29,9 +34,25 @@ class MethodInfo:
 
 MethodMap = Dict[str, MethodInfo] # Mapping of method names to MethodInfo
 
+# wraps a plain function into the class attribute for its method type
+METHOD_WRAPPERS: Dict[MethodType, Callable[[Callable], Any]] = {
+    MethodType.STATIC: staticmethod,
+    MethodType.CLASS: classmethod,
+    MethodType.INSTANCE: lambda func: func,
+}
+
+# function -> (code object, digest), dropped with the function
+_digest_cache: 'WeakKeyDictionary[Callable, tuple[CodeType, bytes]]' = WeakKeyDictionary()
+
 
 class HotReloadMethods:
-    def __init__(self, target_class: Type[Any], auto_reload: bool = True, reload_everything = True) -> None:
+    # kill switch for deployed runs, set HOTRELOAD=0 to never start file watchers
+    enabled: ClassVar[bool] = os.environ.get('HOTRELOAD', '1') != '0'
+    # last loaded module per file as (source digest, module), reloaders of classes in the same file share one exec per save
+    _module_cache: ClassVar[Dict[str, tuple[bytes, ModuleType]]] = {}
+    _cache_lock: ClassVar[Lock] = Lock()
+
+    def __init__(self, target_class: Type[Any], auto_reload: bool = True, reload_everything = True, watch_file: Optional[bool] = None) -> None:
         if not inspect.isclass(target_class):
             raise ValueError(f"Expected a class, got {type(target_class).__name__}")
         self._target_class: Type[Any] = target_class
@@ -41,15 +62,27 @@ class HotReloadMethods:
             raise ValueError(f"Could not determine module for class {target_class.__name__}")
 
         self._file_module_path: str = os.path.abspath(os.path.normcase(class_module.__file__)).lower()
-        self._file_module_name: str = f"{self._target_class.__name__}_{hashlib.md5(self._file_module_path.encode()).hexdigest()}"
+        self._file_module_name: str = f"{os.path.splitext(os.path.basename(self._file_module_path))[0]}_{hashlib.blake2b(self._file_module_path.encode(), digest_size=8).hexdigest()}"
 
         self._on_reload_callbacks: list[Callable[[], None]] = []
 
-        self._observer: Optional[BaseObserver] = None
+        # (mtime, size) of the file as last loaded, events that leave both unchanged skip the reload
+        self._last_stat: Optional[tuple[int, int]] = HotReloadMethods._stat_key(self._file_module_path)
+        # digest of the source as last loaded, re-saves with identical content skip the reload
+        self._last_src_digest: Optional[bytes] = None
+        try:
+            with open(self._file_module_path, 'rb') as f:
+                self._last_src_digest = hashlib.sha1(f.read()).digest()
+        except OSError:
+            pass
+
+        self._watching: bool = False
 
         self.auto_reload: bool = auto_reload
-        # if watch_file:
-        self.start_file_watcher()
+        if watch_file is None:
+            watch_file = HotReloadMethods.enabled
+        if watch_file:
+            self.start_file_watcher()
 
         self.reload_everything: bool = reload_everything
 
@@ -63,27 +96,27 @@ class HotReloadMethods:
 
     def start_file_watcher(self) -> None:
         """Start watching the file for changes."""
-        if self._observer is not None:
+        if self._watching or not HotReloadMethods.enabled:
             return
 
-        event_handler: HotReloadMethods.FileChangeHandler = self.FileChangeHandler(self)
-        self._observer = Observer()
-        self._observer.schedule(event_handler, os.path.dirname(self._file_module_path) or ".", recursive=False)
-        self._observer.daemon = True
-        self._observer.start()
+        _SharedWatchRegistry.subscribe(self._file_module_path, self)
+        self._watching = True
 
     def stop_file_watcher(self) -> None:
         """Stop watching the file for changes."""
-        if self._observer is None:
+        if not self._watching:
             return
 
-        self._observer.stop()
-        self._observer.join()  # Wait for the observer thread to finish
-        self._observer = None
+        _SharedWatchRegistry.unsubscribe(self._file_module_path, self)
+        self._watching = False
+        if not _SharedWatchRegistry.get_subscribers(self._file_module_path):
+            with HotReloadMethods._cache_lock:
+                HotReloadMethods._module_cache.pop(self._file_module_path, None)
+                sys.modules.pop(self._file_module_name, None)
 
     def is_file_watcher_active(self) -> bool:
         """Check if the file watcher is active."""
-        return self._observer is not None and self._observer.is_alive()
+        return self._watching and _SharedWatchRegistry.is_alive()
 
     def on_file_modified(self) -> None:
         """Handle file modification event."""
@@ -99,10 +132,23 @@ class HotReloadMethods:
         """Reload methods from the target class's file and apply changes."""
         # print(f"[{HotReloadMethods.__name__}] Reloading methods for {self._target_class.__name__} from {self._file_module_path}")
         try:
+            stat_key: Optional[tuple[int, int]] = HotReloadMethods._stat_key(self._file_module_path)
+            if stat_key is not None and stat_key == self._last_stat:
+                return
+
+            with open(self._file_module_path, 'rb') as f:
+                src: bytes = f.read()
+            src_digest: bytes = hashlib.sha1(src).digest()
+            if src_digest == self._last_src_digest:
+                self._last_stat = stat_key
+                return
+
             # Get methods from the module
-            module: Optional[ModuleType] = HotReloadMethods._load_module(self._file_module_name, self._file_module_path)
+            module: Optional[ModuleType] = HotReloadMethods._get_cached_module(self._file_module_name, self._file_module_path, src, src_digest)
             if module is None:
                 return
+            self._last_stat = stat_key
+            self._last_src_digest = src_digest
             module_methods: Optional[MethodMap] = HotReloadMethods._get_methods_from_module(module, self._target_class.__name__)
             if module_methods is None:
                 return
@@ -111,29 +157,32 @@ class HotReloadMethods:
 
             changed = False
 
-            # Identify and remove deleted methods, based on nyme and type
-            # deleted_methods: List[str] = [name for name in class_methods if name not in module_methods or class_methods[name].type != module_methods[name].type]
-            deleted_methods: Dict[str, MethodInfo] = {name: info for name, info in class_methods.items() if name not in module_methods or class_methods[name].type != module_methods[name].type}
+            # Split names into removed, common and added with one set operation each, a method whose type changed is removed and added again
+            deleted_methods: Dict[str, MethodInfo] = {name: class_methods[name] for name in class_methods.keys() - module_methods.keys()}
+            new_methods: MethodMap = {name: module_methods[name] for name in module_methods.keys() - class_methods.keys()}
+            same_type: List[str] = []
+            for name in module_methods.keys() & class_methods.keys():
+                if class_methods[name].type != module_methods[name].type:
+                    deleted_methods[name] = class_methods[name]
+                    new_methods[name] = module_methods[name]
+                else:
+                    same_type.append(name)
+
+            # with reload_everything every method is patched and no digests are needed
+            methods_to_update: MethodMap
+            if self.reload_everything:
+                methods_to_update = {name: module_methods[name] for name in same_type}
+            else:
+                methods_to_update = {name: module_methods[name] for name in same_type if HotReloadMethods._is_different(module_methods[name].func, class_methods[name].func)}
+
             if deleted_methods:
                 HotReloadMethods._remove_methods(self._target_class, deleted_methods)
                 changed = True
-
-            # Identify and update changed methods
-            methods_to_update: MethodMap = {}
-            for name, info in module_methods.items():
-                if name in class_methods and class_methods[name].type == info.type:
-                    module_code: Optional[CodeType] = getattr(info.func, "__code__", None)
-                    class_code: Optional[CodeType] = getattr(class_methods[name].func, "__code__", None)
-                    if HotReloadMethods._is_different(module_code, class_code) or self.reload_everything:
-                        methods_to_update[name] = info
             if methods_to_update:
-                HotReloadMethods._update_methods(self._target_class, methods_to_update)
+                HotReloadMethods._apply_methods(self._target_class, methods_to_update, "Patch")
                 changed = True
-
-            # Identify and add new methods
-            new_methods: Dict[str, MethodInfo] = {name: info for name, info in module_methods.items() if name not in class_methods or class_methods[name].type != info.type}
             if new_methods:
-                HotReloadMethods._add_methods(self._target_class, new_methods)
+                HotReloadMethods._apply_methods(self._target_class, new_methods, "Add")
                 changed = True
 
             if changed:
@@ -158,21 +207,46 @@ class HotReloadMethods:
                 print(f"[{self.__class__.__name__}] Error in reload callback: {e}")
 
     @staticmethod
-    def _load_module(module_name: str, file_path: str) -> Optional[ModuleType]:
-        """Load a module from a file path."""
-        spec: Optional[ModuleSpec] = spec_from_file_location(module_name, file_path)
-        if spec is None or spec.loader is None:
-            print(f"[{HotReloadMethods.__name__}] Could not load spec from {file_path}")
+    def _stat_key(file_path: str) -> Optional[tuple[int, int]]:
+        try:
+            st: os.stat_result = os.stat(file_path)
+        except OSError:
             return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _get_cached_module(module_name: str, file_path: str, src: bytes, src_digest: bytes) -> Optional[ModuleType]:
+        """Return the module already loaded from this source by another reloader, or load it."""
+        with HotReloadMethods._cache_lock:
+            cached: Optional[tuple[bytes, ModuleType]] = HotReloadMethods._module_cache.get(file_path)
+            if cached is not None and cached[0] == src_digest:
+                return cached[1]
+            module: Optional[ModuleType] = HotReloadMethods._load_module_from_source(module_name, file_path, src)
+            if module is not None:
+                HotReloadMethods._module_cache[file_path] = (src_digest, module)
+            return module
 
-        module: ModuleType = module_from_spec(spec)
+    @staticmethod
+    def _load_module_from_source(module_name: str, file_path: str, src: bytes) -> Optional[ModuleType]:
+        """Load a module from source that has already been read from file_path."""
+        # drop the previous load so it is not kept alive by sys.modules, and let the finders see fresh directory listings
+        sys.modules.pop(module_name, None)
+        invalidate_caches()
+        # the path and source are known, a plain module avoids the loader reading and compiling the file again
+        module: ModuleType = ModuleType(module_name)
+        module.__file__ = file_path
+        # spec and loader as an import would set them, for code that inspects them (dataclasses, pickle, inspect.getsource)
+        spec: Optional[ModuleSpec] = spec_from_file_location(module_name, file_path)
+        module.__spec__ = spec
+        module.__loader__ = spec.loader if spec is not None else None
         sys.modules[module_name] = module
 
         try:
-            spec.loader.exec_module(module)
+            exec(compile(src, file_path, 'exec', dont_inherit=True), module.__dict__)
             return module
 
         except Exception as e:
+            sys.modules.pop(module_name, None)  # no half initialized module
             print(f"[{HotReloadMethods.__name__}] Error executing module {file_path}: {e}")
             traceback.print_exc()
             return None
@@ -181,18 +255,16 @@ class HotReloadMethods:
     def _get_methods_from_class(obj: Type[Any]) -> MethodMap:
         """Extract all methods (static, class, instance) from a class."""
         methods: MethodMap = {}
-        for name, member in inspect.getmembers(obj):
+        # only the class's own attributes, as raw descriptors so static and class methods yield their plain function
+        for name, attr in obj.__dict__.items():
             if name.startswith('__'):
                 continue
-            if name not in obj.__dict__:
-                continue  # Skip inherited methods
-            attr = inspect.getattr_static(obj, name)
             if isinstance(attr, staticmethod):
-                methods[name] = MethodInfo(MethodType.STATIC, member)
+                methods[name] = MethodInfo(MethodType.STATIC, attr.__func__)
             elif isinstance(attr, classmethod):
-                methods[name] = MethodInfo(MethodType.CLASS, member)
+                methods[name] = MethodInfo(MethodType.CLASS, attr.__func__)
             elif inspect.isfunction(attr):
-                methods[name] = MethodInfo(MethodType.INSTANCE, member)
+                methods[name] = MethodInfo(MethodType.INSTANCE, attr)
         return methods
 
     @staticmethod
@@ -208,33 +280,42 @@ class HotReloadMethods:
         return HotReloadMethods._get_methods_from_class(class_obj)
 
     @staticmethod
-    def _is_different(new_code: Optional[CodeType], last_code: Optional[CodeType]) -> bool:
-        """check if two code objects are different."""
-        if new_code is None:
+    def _is_different(new_func: Callable, last_func: Callable) -> bool:
+        """check if the code of two functions is different."""
+        new_digest: Optional[bytes] = HotReloadMethods._func_digest(new_func)
+        if new_digest is None:
             return False
-        if last_code is None:
-            return True
-
-        if new_code.co_code != last_code.co_code:
-            return True
-        if new_code.co_consts != last_code.co_consts:
-            return True
-        if new_code.co_names != last_code.co_names:
-            return True
-        if new_code.co_varnames != last_code.co_varnames:
-            return True
-        if new_code.co_nlocals != last_code.co_nlocals:
-            return True
-        if new_code.co_stacksize != last_code.co_stacksize:
-            return True
-        if new_code.co_flags != last_code.co_flags:
-            return True
-        if new_code.co_freevars != last_code.co_freevars:
-            return True
-        if new_code.co_cellvars != last_code.co_cellvars:
-            return True
+        return new_digest != HotReloadMethods._func_digest(last_func)
 
-        return False
+    @staticmethod
+    def _func_digest(func: Callable) -> Optional[bytes]:
+        """digest of a function's code, cached per function until its code object is replaced."""
+        code: Optional[CodeType] = getattr(func, "__code__", None)
+        if code is None:
+            return None
+        cached: Optional[tuple[CodeType, bytes]] = _digest_cache.get(func)
+        if cached is not None and cached[0] is code:
+            return cached[1]
+        digest: bytes = HotReloadMethods._code_digest(code)
+        _digest_cache[func] = (code, digest)
+        return digest
+
+    @staticmethod
+    def _code_digest(code: CodeType) -> bytes:
+        """16 byte digest over the fields that define a code object's behaviour, nested code objects are digested recursively."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(code.co_code)
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                h.update(HotReloadMethods._code_digest(const))
+            else:
+                h.update(repr(const).encode())
+            h.update(b'\0')
+        h.update(struct.pack("<IIII", code.co_nlocals, code.co_stacksize, code.co_flags, len(code.co_names)))
+        for names in (code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars):
+            h.update('\0'.join(names).encode())
+            h.update(b'\1')
+        return h.digest()
 
     @staticmethod
     def _remove_methods(target_class: Type[Any], deleted_methods: Dict[str, MethodInfo]) -> None:
@@ -245,50 +326,215 @@ class HotReloadMethods:
                 delattr(target_class, name)
 
     @staticmethod
-    def _update_methods(target_class: Type[Any], methods_to_update: Dict[str, MethodInfo]) -> None:
-        """Update methods that have changed."""
-        for name, info in methods_to_update.items():
-            print(f"[{HotReloadMethods.__name__}] {target_class.__name__} Patch {info.type.name} method: {name}")
-            if info.type == MethodType.STATIC:
-                setattr(target_class, name, staticmethod(info.func))
-            elif info.type == MethodType.CLASS:
-                setattr(target_class, name, classmethod(info.func))
+    def _apply_methods(target_class: Type[Any], methods: Dict[str, MethodInfo], action: str) -> None:
+        """Set methods on the class, wrapped according to their type. Action is only used for logging."""
+        for name, info in methods.items():
+            setattr(target_class, name, METHOD_WRAPPERS[info.type](info.func))
+        if len(methods) > 3:
+            print(f"[{HotReloadMethods.__name__}] {target_class.__name__} {action} {len(methods)} methods")
+        else:
+            for name, info in methods.items():
+                print(f"[{HotReloadMethods.__name__}] {target_class.__name__} {action} {info.type.name} method: {name}")
+
+
+# filesystems that do not deliver native change events reliably, directories on these are polled
+NETWORK_FILESYSTEMS: set[str] = {'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'fuse.sshfs', '9p'}
+POLLING_INTERVAL: float = 2.0
+
+# inotify reports a finished write as close-after-write, subscribing to only that, creations and renames keeps open,
+# access and every partial write from waking the observer, other backends and polling have no close events
+INOTIFY_EVENT_FILTER: list[type[FileSystemEvent]] = [FileClosedEvent, FileCreatedEvent, FileMovedEvent]
+DEFAULT_EVENT_FILTER: list[type[FileSystemEvent]] = [FileModifiedEvent, FileCreatedEvent, FileMovedEvent]
+
+def _is_network_path(path: str) -> bool:
+    """Check if a path lives on a network share, by UNC prefix on Windows or by the mount table on Linux."""
+    if path.startswith('\\\\'):
+        return True
+    try:
+        with open('/proc/mounts') as f:
+            mounts: list[list[str]] = [line.split() for line in f]
+    except OSError:
+        return False
+    path = os.path.realpath(path).lower()
+    mount_point: str = ''
+    fs_type: str = ''
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        point: str = fields[1].lower()
+        if (path == point or path.startswith(point.rstrip('/') + '/')) and len(point) > len(mount_point):
+            mount_point, fs_type = point, fields[2]
+    return fs_type in NETWORK_FILESYSTEMS
+
+
+class _SharedWatchRegistry:
+    """One observer thread for all hot reloaders, each directory is scheduled once and events are dispatched to the reloaders of the modified file.
+    Local directories use the native backend, directories on network shares use a polling observer."""
+    _lock: Lock = Lock()
+    _observers: Dict[bool, BaseObserver] = {}  # keyed by polling
+    _watches: Dict[str, tuple[BaseObserver, ObservedWatch, '_FileChangeHandler']] = {}
+    # reloaders per watched file, replaced instead of mutated so the observer thread can read without the lock
+    _subscribers: Dict[str, tuple['HotReloadMethods', ...]] = {}
+    # file names of all watched paths, lets the handler drop events for other files before normalizing their path
+    _names: frozenset[str] = frozenset()
+
+    @classmethod
+    def subscribe(cls, file_path: str, reloader: HotReloadMethods) -> None:
+        directory: str = os.path.dirname(file_path) or "."
+        with cls._lock:
+            reloaders: tuple[HotReloadMethods, ...] = cls._subscribers.get(file_path, ())
+            if reloader in reloaders:
+                return
+            cls._subscribers[file_path] = reloaders + (reloader,)
+            cls._names = frozenset(os.path.basename(path) for path in cls._subscribers)
+
+            if directory not in cls._watches:
+                polling: bool = _is_network_path(directory)
+                observer: BaseObserver = cls._get_observer(polling)
+                handler: _FileChangeHandler = _FileChangeHandler()
+                event_filter: list[type[FileSystemEvent]] = INOTIFY_EVENT_FILTER if sys.platform.startswith('linux') and not polling else DEFAULT_EVENT_FILTER
+                cls._watches[directory] = (observer, observer.schedule(handler, directory, recursive=False, event_filter=event_filter), handler)
+
+    @classmethod
+    def unsubscribe(cls, file_path: str, reloader: HotReloadMethods) -> None:
+        directory: str = os.path.dirname(file_path) or "."
+        observers: list[BaseObserver] = []
+        with cls._lock:
+            reloaders: tuple[HotReloadMethods, ...] = tuple(r for r in cls._subscribers.get(file_path, ()) if r is not reloader)
+            if reloaders:
+                cls._subscribers[file_path] = reloaders
             else:
-                setattr(target_class, name, info.func)
+                cls._subscribers.pop(file_path, None)
+                watched: Optional[tuple[BaseObserver, ObservedWatch, _FileChangeHandler]] = cls._watches.get(directory)
+                if watched is not None:
+                    watched[2].cancel(file_path)
+            cls._names = frozenset(os.path.basename(path) for path in cls._subscribers)
+
+            # unschedule the directory once none of its files are watched anymore
+            if any(os.path.dirname(path) == directory for path in cls._subscribers):
+                return
+            entry: Optional[tuple[BaseObserver, ObservedWatch, _FileChangeHandler]] = cls._watches.pop(directory, None)
+            if entry is not None:
+                entry[0].unschedule(entry[1])
+            # release the observer threads once nothing is watched anymore, detached here and stopped outside the lock
+            if not cls._watches:
+                observers = list(cls._observers.values())
+                cls._observers.clear()
+        cls._stop_observers(observers)
+
+    @classmethod
+    def get_subscribers(cls, file_path: str) -> tuple[HotReloadMethods, ...]:
+        return cls._subscribers.get(file_path, ())
+
+    @classmethod
+    def is_watched_name(cls, file_name: str) -> bool:
+        return file_name in cls._names
+
+    @classmethod
+    def is_alive(cls) -> bool:
+        return any(observer.is_alive() for observer in list(cls._observers.values()))
 
     @staticmethod
-    def _add_methods(target_class: Type[Any], methods_to_add: Dict[str, MethodInfo]) -> None:
-        """Add methods that are new in the updated code."""
-        for name, info in methods_to_add.items():
-            print(f"[{HotReloadMethods.__name__}] {target_class.__name__} Add {info.type.name} method: {name}")
-            if info.type == MethodType.STATIC:
-                setattr(target_class, name, staticmethod(info.func))
-            elif info.type == MethodType.CLASS:
-                setattr(target_class, name, classmethod(info.func))
-            else:
-                setattr(target_class, name, info.func)
-
-    class FileChangeHandler(FileSystemEventHandler):
-        def __init__(self, reloader: 'HotReloadMethods') -> None:
-            self._reloader: HotReloadMethods = reloader
-            self._last_modified_time: float = 0
-            self._debounce_seconds: float = 0.5  # Wait 500ms between reloads
-
-        def on_modified(self, event: FileSystemEvent) -> None:
-            """Handle file modification events."""
-            current_time: float = time.time()
-            if current_time - self._last_modified_time < self._debounce_seconds:
-                return
+    def _stop_observers(observers: list[BaseObserver], timeout: float = 2.0) -> None:
+        # bounded join, a backend stuck in a native call must not hang the caller
+        for observer in observers:
+            observer.unschedule_all()
+            observer.stop()
+        for observer in observers:
+            observer.join(timeout=timeout)
+            if observer.is_alive():
+                print(f"[{HotReloadMethods.__name__}] File watcher did not stop within {timeout} seconds")
+
+    @classmethod
+    def _get_observer(cls, polling: bool) -> BaseObserver:
+        observer: Optional[BaseObserver] = cls._observers.get(polling)
+        if observer is None:
+            observer = PollingObserver(timeout=POLLING_INTERVAL) if polling else Observer()
+            observer.daemon = True
+            observer.start()
+            cls._observers[polling] = observer
+        return observer
+
+
+# reloads run one at a time on this worker, off the observer and timer threads
+_reload_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hotreload')
+
+
+class _FileChangeHandler(FileSystemEventHandler):
+    def __init__(self) -> None:
+        self._debounce_seconds: float = 0.5  # Reload once the file has been quiet for 500ms
+        self._timers: Dict[str, Timer] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock: Lock = Lock()
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        """Handle file modification events."""
+        if not event.is_directory:
+            self._on_path(event.src_path)
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        """Handle files that were closed after writing, the only write event subscribed to on inotify."""
+        if not event.is_directory:
+            self._on_path(event.src_path)
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        """Handle files that are written by deleting and recreating them."""
+        if not event.is_directory:
+            self._on_path(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle atomic saves that write a temporary file and rename it over the watched file."""
+        if not event.is_directory:
+            self._on_path(event.dest_path)
+
+    def _on_path(self, path: bytes | str) -> None:
+        src_path: str = ""
+        if isinstance(path, bytes):
+            src_path = path.decode('utf-8')
+        if isinstance(path, str):
+            src_path = path
+
+        # editors write swap and backup files next to the source, drop anything that is not a python file first
+        if not src_path.endswith('.py'):
+            return
+        # cheap name check next, abspath and normcase only for files that are actually watched
+        if not _SharedWatchRegistry.is_watched_name(os.path.basename(src_path).lower()):
+            return
 
-            src_path: str = ""
-            if isinstance(event.src_path, bytes):
-                src_path = event.src_path.decode('utf-8')
-            if isinstance(event.src_path, str):
-                src_path = event.src_path
+        event_path: str = os.path.abspath(os.path.normcase(src_path)).lower()
+        if not _SharedWatchRegistry.get_subscribers(event_path):
+            return
 
-            event_path: str = os.path.abspath(os.path.normcase(src_path)).lower()
-            watched_path: str = os.path.abspath(os.path.normcase(self._reloader._file_module_path)).lower()
-            if event_path == watched_path:
-                self._last_modified_time = current_time
-                self._reloader.on_file_modified()
+        # trailing edge debounce, every event restarts the timer so a burst of saves results in a single reload
+        with self._lock:
+            timer: Optional[Timer] = self._timers.get(event_path)
+            if timer is not None:
+                timer.cancel()
+            timer = Timer(self._debounce_seconds, self._dispatch, (event_path,))
+            timer.daemon = True
+            self._timers[event_path] = timer
+            timer.start()
+
+    def cancel(self, event_path: str) -> None:
+        """Drop a pending reload, for files that are no longer watched."""
+        with self._lock:
+            timer: Optional[Timer] = self._timers.pop(event_path, None)
+            pending: Optional[Future] = self._pending.pop(event_path, None)
+        if timer is not None:
+            timer.cancel()
+        if pending is not None:
+            pending.cancel()
+
+    def _dispatch(self, event_path: str) -> None:
+        with self._lock:
+            self._timers.pop(event_path, None)
+            # a reload that is queued but not started yet will read the latest source, a running one might not
+            pending: Optional[Future] = self._pending.get(event_path)
+            if pending is not None and not pending.running() and not pending.done():
+                return
+            self._pending[event_path] = _reload_executor.submit(self._reload, event_path)
 
+    @staticmethod
+    def _reload(event_path: str) -> None:
+        for reloader in _SharedWatchRegistry.get_subscribers(event_path):
+            reloader.on_file_modified()
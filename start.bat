@@ -14,6 +14,9 @@ if "%ERRORLEVEL%"=="0" (
 
 set "CURRENT_DIR=%~dp0"
 
+@REM no file watchers for hot reloading in deployed runs
+set "HOTRELOAD=0"
+
 echo Opening Main App
 start "" "%CURRENT_DIR%.venv\Scripts\pythonw.exe" launcher.py
 timeout /t 2 /nobreak >nul